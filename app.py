@@ -1,48 +1,130 @@
+import os, sqlite3, zlib
 import streamlit as st
-from fw.db import ss, seed_demo, export_universe_json, import_universe_json, current_week
+from fw.st_state import ss, sim_job, set_sim_job, write, locked, league_name, REFUSED
+from fw.db import seed_demo, export_universe, EXPORT_FORMATS, import_universe_json, current_week, ticker_recent
 from fw.sim.engine import run_all_cards_this_week
+from fw.sim.background import SimJob
+from fw.seedgen import seed_generated
 from fw.logic import universe as uni  # for schedule utils if you add later
+from fw.journal import JournalStore
+from fw.sqlite_store import SqliteStore
+from fw.colstore import ColumnStore, ColumnFile
 
 st.set_page_config(page_title="Federation Wars — Alpha", layout="wide")
 ss()  # ensure db exists
 
+@st.fragment(run_every=0.5)
+def sim_progress():
+    job = sim_job()
+    if job is None: return
+    done, weeks = job.progress()
+    if job.running:
+        st.progress(done / weeks, text=f"Simulating… week {done}/{weeks}")
+        if st.button("Cancel", disabled=job.canceled): job.cancel()
+    elif not job.published:
+        st.rerun()   # full rerun: ss() publishes the results
+
+def sim_result():
+    ok, job = st.session_state.pop("sim_result", (None, None))
+    if job is None: return
+    if job.error: st.error(f"Simulation failed, no weeks were kept: {job.error.splitlines()[-1]}")
+    elif ok: st.success(f"Simulated {job.done} week(s)" + (" (canceled)" if job.canceled else "") + ".")
+    elif job.done: st.warning("The universe changed during the run; simulated weeks were discarded.")
+
 with st.sidebar:
     st.title("Federation Wars α")
     st.caption("Text sim • early alpha")
+    if league_name(): st.caption(f"🔗 Shared league **{league_name()}** — everyone on this league sees the same universe")
     st.metric("In-game Week", current_week())
+    job = sim_job()
+    busy = job is not None and job.running   # the background run publishes over the live universe
+
+    if st.button("Seed Demo Data", disabled=busy):
+        if write(seed_demo) is not REFUSED: st.success("Seeded demo data.")
 
-    if st.button("Seed Demo Data"):
-        seed_demo()
-        st.success("Seeded demo data.")
+    with st.expander("Generate large universe"):
+        g1, g2 = st.columns(2)
+        with g1: g_feds = st.number_input("Federations", 1, 5000, 50)
+        with g2: g_workers = st.number_input("Workers", 0, 500_000, 1000, step=1000)
+        g_hist = st.number_input("Weeks of history", 0, 1040, 0)
+        g_seed = st.number_input("Seed", 0, 2**31-1, 0)
+        if st.button("Generate", disabled=busy):
+            if write(seed_generated, feds=g_feds, workers=g_workers, history=g_hist, seed=g_seed) is not REFUSED:
+                st.success(f"Generated {g_feds} feds / {g_workers} workers.")
 
-    if st.button("Run All Cards (This Week)"):
-        run_all_cards_this_week()
+    if st.button("Run All Cards (This Week)", disabled=busy):
+        write(run_all_cards_this_week)
 
-    if st.button("Skip Time (+1 week)"):
-        uni.skip_time()
+    if st.button("Skip Time (+1 week)", disabled=busy):
+        write(uni.skip_time)
+
+    s1, s2 = st.columns([2, 1])
+    with s1: sim_weeks = st.number_input("Weeks", 1, 1040, 52, label_visibility="collapsed")
+    with s2:
+        if st.button("Simulate", disabled=busy):
+            # the working copy is taken under the league lock; publish re-checks the version
+            write(lambda: set_sim_job(SimJob(st.session_state.universe, int(sim_weeks)).start()))
+    sim_progress()
+    sim_result()
 
     st.divider()
     st.subheader("Save / Load")
-    st.download_button(
-        "Download universe.json",
-        data=export_universe_json(),
-        file_name="universe.json",
-        mime="application/json"
-    )
-    uploaded = st.file_uploader("Load JSON", type=["json"])
-    if uploaded:
+    # serialized only on request, then cached until the universe changes (export_universe)
+    fmt = st.selectbox("Export format", list(EXPORT_FORMATS),
+                       format_func={"json": "JSON (readable)", "compact": "JSON (compact)", "gzip": "JSON (compact, gzip)"}.get)
+    file_name, mime = EXPORT_FORMATS[fmt]
+    with locked(): payload = export_universe(fmt, build=False)
+    if payload is None and st.button("Prepare download"):
+        with locked(): payload = export_universe(fmt)
+    if payload is not None:
+        st.download_button(f"Download {file_name} ({len(payload) / 1e6:.1f} MB)", data=payload,
+                           file_name=file_name, mime=mime)
+    uploaded = st.file_uploader("Load JSON", type=["json", "gz"], disabled=busy)
+    # the widget keeps its file across reruns: import each upload once, not on every rerun
+    if uploaded and st.session_state.get("imported_file_id") != uploaded.file_id:
+        st.session_state.imported_file_id = uploaded.file_id
         try:
-            import_universe_json(uploaded.read().decode("utf-8"))
-            st.success("Loaded universe.json")
+            if write(import_universe_json, uploaded.read()) is not REFUSED:
+                st.success(f"Loaded {uploaded.name}")
         except Exception as e:
             st.error(f"Import failed: {e}")
 
+    with st.expander("Server-side save"):
+        jpath = st.text_input("Path (.db = SQLite, .fwc = columnar, else journal)", "universe.fw.json")
+        store = st.session_state.get("store")
+        if store is None or store.path != jpath:
+            store = st.session_state.store = (SqliteStore(jpath) if jpath.endswith(".db") else
+                                              ColumnStore(jpath) if jpath.endswith(".fwc") else JournalStore(jpath))
+        if isinstance(store, ColumnStore) and os.path.exists(jpath):
+            try:   # header only: no column is decompressed
+                with ColumnFile(jpath) as f: info = f.summary()
+                st.caption(f"Week {info['universe']['current_week']} • " +
+                           " • ".join(f"{n:,} {c}" for c, n in info["rows"].items()))
+            except (OSError, ValueError) as e: st.caption(f"Unreadable: {e}")
+        j1, j2 = st.columns(2)
+        with j1:
+            if st.button("Save (incremental)"):
+                try:
+                    with locked(): store.save(st.session_state.universe)
+                    st.success(f"Saved {jpath}")
+                except (OSError, sqlite3.Error) as e: st.error(f"Save failed: {e}")
+        with j2:
+            if st.button("Load", disabled=busy):
+                def load():
+                    u = st.session_state.universe
+                    loaded = store.load(ticker_spill=u.ticker_spill)
+                    u.load(loaded.data)
+                    u.mark_clean(loaded.clean_token)   # same state: the store stays in sync, saves stay incremental
+                try:
+                    if write(load) is not REFUSED: st.success(f"Loaded {jpath}")
+                except (OSError, ValueError, sqlite3.Error, zlib.error) as e: st.error(f"Load failed: {e}")
+
 # Small ticker strip visible on every page
 def render_ticker_strip(n=6):
-    events = st.session_state.db["ticker"][:n]
-    if events:
+    with locked():   # headlines render from the live universe
+        events = ticker_recent(n)
         line = " | ".join([f"[{e['type']}] {e['headline']}" for e in events])
-        st.info(line, icon="📰")
+    if events: st.info(line, icon="📰")
 
 render_ticker_strip()
 
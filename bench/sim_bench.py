@@ -0,0 +1,178 @@
+"""Benchmarks for the simulation hot paths.
+
+    python -m bench.sim_bench                       # all scales, compare to bench/baseline.json
+    python -m bench.sim_bench --scales small,1k     # subset
+    python -m bench.sim_bench --update              # re-record the baseline on this machine
+
+Every case runs on a fresh copy of its scale's universe. Times are best of
+--repeat runs. A case regresses when it is slower than its baseline by more
+than --tolerance (default 50%) and by more than --floor-ms (default 5 ms, so
+sub-millisecond jitter never fails a run); any regression exits with 1.
+Baselines are machine-specific: record them on the machine you compare on.
+"""
+import argparse, json, os, sys, tempfile, time, tracemalloc
+from fw.db import (Universe, bound, seed_demo, state, export_universe_json, export_universe, import_universe_json,
+                   fed_employed_workers, shows_for_week)
+from fw.seedgen import generate_universe
+from fw.sim.booking import ensure_card
+from fw.sim.engine import run_card, run_all_cards_this_week, simulate_weeks
+from fw.logic.universe import skip_time, schedule_weekly_if_missing
+from fw import colstore
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def _demo():
+    u = Universe()
+    with bound(u): seed_demo()
+    return u
+
+def _history(weeks):
+    u = Universe(generate_universe(feds=20, workers=1000, seed=3))
+    with bound(u): simulate_weeks(weeks)
+    return u
+
+SCALES = {
+    "small": _demo,
+    "1k": lambda: Universe(generate_universe(feds=20, workers=1000, seed=1)),
+    "50k": lambda: Universe(generate_universe(feds=500, workers=50_000, seed=2)),
+    "10y": lambda: _history(520),
+}
+
+# case -> (fn(u) -> units of work done, unit label)
+def _ensure_cards(u):
+    before = len(state()["matches"])
+    for s in shows_for_week(state()["universe"]["current_week"], "upcoming"): ensure_card(s["id"])
+    return len(state()["matches"]) - before
+
+def _run_cards(u):
+    before = len(state()["matches"])
+    for s in shows_for_week(state()["universe"]["current_week"], "upcoming"): run_card(s["id"])
+    return len(state()["matches"]) - before
+
+def _run_week(u):
+    before = len(state()["matches"])
+    run_all_cards_this_week()
+    return len(state()["matches"]) - before
+
+def _skip(u, weeks=10):
+    for _ in range(weeks): skip_time()
+    return weeks
+
+def _schedule(u, weeks=10):
+    wk = state()["universe"]["current_week"]
+    for i in range(1, weeks + 1): schedule_weekly_if_missing(wk + i)
+    return weeks
+
+def _roster(u):
+    for fid in state()["federations"]: fed_employed_workers(fid)
+    return len(state()["federations"])
+
+def _export(u):
+    export_universe_json(); return 1
+
+def _export_gzip(u):
+    export_universe("gzip"); return 1
+
+def _import(u, text=None):
+    import_universe_json(text); return 1
+
+_FWC = os.path.join(tempfile.gettempdir(), f"fw-bench-{os.getpid()}.fwc")
+
+def _col_write(u):
+    colstore.write(u.data, _FWC); return 1
+
+def _col_load(u):
+    colstore.ColumnStore(_FWC).load(); return 1
+
+CASES = {
+    "ensure_card": (_ensure_cards, "matches"),
+    "run_card": (_run_cards, "matches"),
+    "run_all_cards_this_week": (_run_week, "matches"),
+    "skip_time": (_skip, "weeks"),
+    "schedule_weekly_if_missing": (_schedule, "weeks"),
+    "fed_employed_workers": (_roster, "feds"),
+    "export_universe_json": (_export, "exports"),
+    "export_gzip": (_export_gzip, "exports"),   # compact + gzip, cold cache
+    "import_universe_json": (_import, "imports"),
+    "colstore_write": (_col_write, "saves"),
+    "colstore_load": (_col_load, "loads"),   # reads the file colstore_write left
+}
+
+def bench_scale(name, repeat):
+    t0 = time.perf_counter(); base = SCALES[name]()
+    build_s = time.perf_counter() - t0
+    with bound(base): text = export_universe_json()
+    out = {"build_s": build_s, "cases": {}}
+    for case, (fn, unit) in CASES.items():
+        best, units = None, 0
+        for _ in range(repeat):
+            u = Universe.from_json(text, seed=0)
+            with bound(u):
+                kw = {"text": text} if case == "import_universe_json" else {}
+                t0 = time.perf_counter(); units = fn(u, **kw); dt = time.perf_counter() - t0
+            best = dt if best is None else min(best, dt)
+        out["cases"][case] = {"seconds": best, "units": units, "unit": unit,
+                              "per_sec": units / best if best else 0.0}
+    # peak traced allocation for one full simulated week on a fresh copy
+    tracemalloc.start()
+    u = Universe.from_json(text, seed=0)
+    with bound(u): simulate_weeks(1)
+    out["peak_mem_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    if os.path.exists(_FWC): os.remove(_FWC)
+    return out
+
+def compare(results, baseline, tolerance, floor_s=0.005):
+    regressions = []
+    for scale, r in results.items():
+        b_mem = baseline.get(scale, {}).get("peak_mem_mb")
+        if b_mem and r["peak_mem_mb"] > b_mem * (1 + tolerance):
+            regressions.append(f"{scale}/peak_mem: {b_mem:.1f}MB → {r['peak_mem_mb']:.1f}MB")
+        for case, c in r["cases"].items():
+            b = baseline.get(scale, {}).get("cases", {}).get(case)
+            if b and c["seconds"] > b["seconds"] * (1 + tolerance) and c["seconds"] - b["seconds"] > floor_s:
+                regressions.append(f"{scale}/{case}: {b['seconds']*1e3:.2f}ms → {c['seconds']*1e3:.2f}ms "
+                                   f"({c['seconds']/b['seconds']:.2f}x)")
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench.sim_bench", description=__doc__.splitlines()[0])
+    ap.add_argument("--scales", default=",".join(SCALES), help=f"comma list of {', '.join(SCALES)}")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--tolerance", type=float, default=0.5)
+    ap.add_argument("--floor-ms", type=float, default=5.0)
+    ap.add_argument("--update", action="store_true", help="write results as the new baseline")
+    ap.add_argument("--json", metavar="PATH", help="also write raw results here")
+    args = ap.parse_args(argv)
+
+    results = {}
+    for name in args.scales.split(","):
+        print(f"== {name}", file=sys.stderr)
+        r = results[name] = bench_scale(name, args.repeat)
+        print(f"   build {r['build_s']:.2f}s • peak week mem {r['peak_mem_mb']:.2f} MB", file=sys.stderr)
+        for case, c in r["cases"].items():
+            print(f"   {case:28s} {c['seconds']*1e3:10.2f} ms  {c['per_sec']:12.1f} {c['unit']}/s", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh: json.dump(results, fh, indent=2)
+    if args.update:
+        old = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as fh: old = json.load(fh)
+        with open(args.baseline, "w", encoding="utf-8") as fh: json.dump({**old, **results}, fh, indent=2)
+        print(f"baseline updated → {args.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline; run with --update to record one", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding="utf-8") as fh: baseline = json.load(fh)
+    regressions = compare(results, baseline, args.tolerance, args.floor_ms / 1e3)
+    untracked = [f"{scale}/{case}" for scale, r in results.items() for case in r["cases"]
+                 if case not in baseline.get(scale, {}).get("cases", {})]
+    if untracked: print(f"no baseline for {', '.join(untracked)}; run with --update to record", file=sys.stderr)
+    for line in regressions: print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
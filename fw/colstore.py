@@ -0,0 +1,202 @@
+"""Columnar binary save format (.fwc).
+
+One file: a magic line, a JSON header index, then zlib-compressed column
+segments. Every collection (federations, workers, shows, matches,
+employment, ticker) is stored column by column; the header records each
+column's encoding and byte range, plus the universe header and row counts.
+
+    magic (8 bytes) | header length (u64 LE) | header JSON | segments...
+
+Column encodings: i64 / f64 / bool as packed arrays, low-cardinality
+strings as `cat` (value table in the header + u16/u32 codes), anything else
+as one JSON array. A column with None or absent keys carries a `mask`
+segment (0 = value, 1 = None, 2 = key absent).
+
+Reading memory-maps the file and decompresses only the columns asked for:
+`ColumnFile.summary()` needs the header alone (the sidebar shows it before
+loading) and `rows(coll, fields)` a few columns, for tools. Loading a league
+is not selective: the app and fw.run work on a full in-memory Universe, so
+`load()` decompresses every column. It builds the Universe one column at a
+time instead of holding a whole parsed JSON document next to it, which is
+where its lower peak memory comes from; pages do not read from the file.
+
+    python -m fw.colstore to-col universe.json universe.fwc
+    python -m fw.colstore to-json universe.fwc universe.json
+    python -m fw.colstore info universe.fwc
+"""
+import json, mmap, os, struct, sys, zlib
+from array import array
+from fw.db import Universe, _parse_universe_json, _json_default, gc_paused
+
+MAGIC = b"FWCOL1\n\0"
+KEYED = ("federations", "workers", "shows", "matches")   # id -> entity dicts
+LISTS = ("employment", "ticker")                          # ordered lists (ticker newest first)
+I64_MIN, I64_MAX = -2**63, 2**63 - 1
+VALUE, NONE, ABSENT = 0, 1, 2
+_ABSENT = object()
+
+def _rows(data, coll):
+    c = data[coll]
+    rows = c.values() if coll in KEYED else (c.to_list() if hasattr(c, "to_list") else c)
+    return [r if type(r) is dict else r.to_dict() for r in rows]
+
+# ---------- write ----------
+def _kind(vals):
+    if all(type(v) is bool for v in vals): return "bool"
+    if all(type(v) is int and I64_MIN < v <= I64_MAX for v in vals): return "i64"
+    if all(type(v) is float for v in vals): return "f64"
+    if all(type(v) is str for v in vals) and len(set(vals)) <= min(65535, len(vals) // 4): return "cat"
+    return "json"
+
+def _encode_column(name, rows, segs):
+    raw = [r.get(name, _ABSENT) for r in rows]
+    mask = array("b", (VALUE if v is not _ABSENT and v is not None else NONE if v is None else ABSENT for v in raw))
+    present = [v for v in raw if v is not _ABSENT and v is not None]
+    kind = _kind(present)
+    fill = {"bool": False, "i64": 0, "f64": 0.0}.get(kind, None if kind == "json" else "")
+    vals = [fill if v is _ABSENT or v is None else v for v in raw]
+    col = {"name": name, "kind": kind}
+    if kind == "bool": payload = array("b", vals).tobytes()
+    elif kind == "i64": payload = array("q", vals).tobytes()
+    elif kind == "f64": payload = array("d", vals).tobytes()
+    elif kind == "cat":
+        table = sorted(set(vals)); code = {v: i for i, v in enumerate(table)}
+        col["values"] = table
+        payload = array("H" if len(table) <= 65535 else "I", [code[v] for v in vals]).tobytes()
+    else: payload = json.dumps(vals, separators=(",", ":"), default=_json_default).encode("utf-8")
+    col["seg"] = _segment(payload, segs)
+    if any(mask): col["mask"] = _segment(mask.tobytes(), segs)
+    return col
+
+def _segment(payload, segs):
+    z = zlib.compress(payload, 6)
+    off = sum(len(s) for s in segs)   # segments are few (one per column), so this stays cheap
+    segs.append(z)
+    return [off, len(z), len(payload)]
+
+def write(data, path):
+    """Write a universe db dict as a .fwc file (atomic replace). Returns bytes written."""
+    segs, colls = [], {}
+    with gc_paused():
+        for coll in KEYED + LISTS:
+            rows = _rows(data, coll)
+            names = list(dict.fromkeys(k for r in rows for k in r))   # first-seen order
+            colls[coll] = {"rows": len(rows), "columns": [_encode_column(n, rows, segs) for n in names]}
+    header = json.dumps({"format": 1, "universe": data["universe"], "collections": colls},
+                        separators=(",", ":")).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC); fh.write(struct.pack("<Q", len(header))); fh.write(header)
+        for s in segs: fh.write(s)
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+# ---------- read ----------
+class ColumnFile:
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, "rb")
+        self.mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mm[:8] != MAGIC: raise ValueError(f"{path}: not a .fwc file")
+        (n,) = struct.unpack("<Q", self.mm[8:16])
+        self.header = json.loads(self.mm[16:16+n])
+        self.base = 16 + n
+        self.cols = {c: {col["name"]: col for col in meta["columns"]} for c, meta in self.header["collections"].items()}
+
+    def close(self):
+        self.mm.close(); self._fh.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    def _bytes(self, seg):
+        off, n, _ = seg
+        return zlib.decompress(self.mm[self.base+off:self.base+off+n])
+
+    def summary(self):
+        """Universe header and row counts - no column is decompressed."""
+        return {"universe": self.header["universe"],
+                "rows": {c: m["rows"] for c, m in self.header["collections"].items()}}
+
+    def count(self, coll): return self.header["collections"][coll]["rows"]
+    def fields(self, coll): return list(self.cols[coll])
+
+    def column(self, coll, name):
+        """Decoded values of one column; None where null, _ABSENT where the key is missing."""
+        col = self.cols[coll][name]; kind = col["kind"]; b = self._bytes(col["seg"])
+        if kind == "bool": vals = [bool(v) for v in array("b", b)]
+        elif kind in ("i64", "f64"): vals = array("q" if kind == "i64" else "d", b).tolist()
+        elif kind == "cat":
+            table = col["values"]; codes = array("H" if len(table) <= 65535 else "I", b)
+            vals = [table[i] for i in codes]
+        else: vals = json.loads(b)
+        if "mask" in col:
+            for i, m in enumerate(self._bytes(col["mask"])):
+                if m: vals[i] = None if m == NONE else _ABSENT
+        return vals
+
+    def rows(self, coll, fields=None):
+        """Rows as dicts, reading only `fields` (default: all columns)."""
+        names = fields or self.fields(coll)
+        with gc_paused():
+            cols = [self.column(coll, n) for n in names]
+            out = [dict(zip(names, vals)) for vals in zip(*cols)] if cols else [{} for _ in range(self.count(coll))]
+            for n, vals in zip(names, cols):
+                if "mask" in self.cols[coll][n]:
+                    for r, v in zip(out, vals):
+                        if v is _ABSENT: del r[n]
+        return out
+
+    def data(self):
+        """The full db dict (plain dicts, as after json.loads)."""
+        d = {"universe": dict(self.header["universe"])}
+        for coll in KEYED: d[coll] = {r["id"]: r for r in self.rows(coll)}
+        for coll in LISTS: d[coll] = self.rows(coll)
+        return d
+
+    def load(self, **universe_kw):
+        with gc_paused(): u = Universe(self.data(), **universe_kw)
+        u.mark_clean()
+        return u
+
+class ColumnStore:
+    """Save/load adapter with the JournalStore/SqliteStore interface; every save is a full snapshot."""
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, u):
+        n = write(u.data, self.path)
+        u.mark_clean()
+        return n
+
+    def load(self, **universe_kw):
+        with ColumnFile(self.path) as f: return f.load(**universe_kw)
+
+# ---------- JSON interchange ----------
+def json_to_col(text, path): return write(_parse_universe_json(text), path)
+
+def col_to_json(path):
+    with ColumnFile(path) as f: return json.dumps(f.data(), indent=2, default=_json_default)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not ((len(argv) == 3 and argv[0] in ("to-col", "to-json")) or (len(argv) == 2 and argv[0] == "info")):
+        print("usage: python -m fw.colstore to-col UNIVERSE.json OUT.fwc | to-json IN.fwc UNIVERSE.json | info IN.fwc",
+              file=sys.stderr)
+        return 2
+    if argv[0] == "to-col":
+        with open(argv[1], encoding="utf-8") as fh: json_to_col(fh.read(), argv[2])
+    elif argv[0] == "to-json":
+        text = col_to_json(argv[1])
+        with open(argv[2], "w", encoding="utf-8") as fh: fh.write(text)
+    else:
+        with ColumnFile(argv[1]) as f:
+            print(json.dumps(f.summary(), indent=2))
+            for coll, meta in f.header["collections"].items():
+                for col in meta["columns"]:
+                    print(f"{coll:12} {col['name']:20} {col['kind']:5} {col['seg'][1]:>10} B"
+                          f"  ({col['seg'][2]} raw){'  +mask' if 'mask' in col else ''}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,60 +1,258 @@
-import json, random
-import streamlit as st
-from fw.util.ids import new_id
-from fw.models import FED_STYLES, GENDERS
-
-def ss():
-    if "db" not in st.session_state:
-        st.session_state.db = {
-            "universe": {"name": "Universe 0", "current_week": 1, "rng_seed": 42, "archived": False},
-            "federations": {},     # fed_id -> dict
-            "workers": {},         # worker_id -> dict
-            "employment": [],      # list of {worker_id, fed_id, start_week, end_week, masked}
-            "shows": {},           # show_id -> dict
-            "matches": {},         # match_id -> dict
-            "ticker": []           # list of events
-        }
-        random.seed(42)
-
-def add_ticker(event_type, headline, blurb="", severity=2, confidence=1.0, entities=None):
-    ss()
-    db = st.session_state.db
-    db["ticker"].insert(0, {
-        "id": new_id("evt"),
-        "ts": __import__("datetime").datetime.utcnow().isoformat()+"Z",
-        "type": event_type,
-        "severity": severity,
-        "confidence": confidence,
-        "entities": entities or {},
-        "headline": headline,
-        "blurb": blurb,
-        "week": db["universe"]["current_week"]
-    })
+import gc, gzip, json, random, contextvars
+from collections import ChainMap
+from contextlib import contextmanager
+from fw.util.ids import IdAllocator
+from fw.models import FED_STYLES, GENDERS, Record, Show, Match, Event
+from fw.ticker import Ticker
+from fw.timeline import Timeline
+from fw import perf
+
+def empty_db():
+    return {
+        "universe": {"name": "Universe 0", "current_week": 1, "rng_seed": 42, "archived": False},
+        "federations": {},     # fed_id -> dict
+        "workers": {},         # worker_id -> dict
+        "employment": [],      # list of {worker_id, fed_id, start_week, end_week, masked}
+        "shows": {},           # show_id -> Show
+        "matches": {},         # match_id -> Match
+        "ticker": []           # events, newest first (a Ticker while loaded)
+    }
+
+# ---------- Indexes ----------
+# Secondary lookups over the db dict. Never serialized; rebuilt from the raw
+# collections on import/seed and kept current by the CRUD functions below.
+class Indexes:
+    def __init__(self, db):
+        self.matches_by_show = {}     # show_id -> [match_id]
+        self.shows_by_week = {}       # week -> status -> {show_id: None}  (ordered set)
+        self.shows_by_status = {}     # status -> {show_id: None}
+        self.shows_by_fed = {}        # fed_id -> [show_id]
+        self.emp_by_fed = {}          # fed_id -> [employment record]
+        self.emp_by_worker = {}       # worker_id -> [employment record]
+        for s in db["shows"].values(): self.add_show(s)
+        for m in db["matches"].values(): self.add_match(m)
+        for e in db["employment"]: self.add_employment(e)
+
+    # shows and matches are fw.models records: attribute reads, not m["..."]
+    def add_show(self, s):
+        sid, status = s.id, s.status
+        self.shows_by_week.setdefault(s.scheduled_week, {}).setdefault(status, {})[sid] = None
+        self.shows_by_status.setdefault(status, {})[sid] = None
+        self.shows_by_fed.setdefault(s.federation_id, []).append(sid)
+
+    def move_show(self, s, old_status):
+        sid, status = s.id, s.status
+        by_status = self.shows_by_week.setdefault(s.scheduled_week, {})
+        by_status.get(old_status, {}).pop(sid, None)
+        by_status.setdefault(status, {})[sid] = None
+        self.shows_by_status.get(old_status, {}).pop(sid, None)
+        self.shows_by_status.setdefault(status, {})[sid] = None
+
+    def add_match(self, m):
+        self.matches_by_show.setdefault(m.show_id, []).append(m.id)
+
+    def add_employment(self, e):
+        self.emp_by_fed.setdefault(e["fed_id"], []).append(e)
+        self.emp_by_worker.setdefault(e["worker_id"], []).append(e)
+
+# ---------- Universe ----------
+# One universe = the raw db dict + its indexes. Nothing here knows about
+# Streamlit; the UI binds its session's Universe via fw.st_state.ss(), the CLI
+# and batch runners bind theirs with use()/bound().
+class Universe:
+    def __init__(self, data=None, seed=None, ticker_spill=None):
+        self.data = data if data is not None else empty_db()
+        self.ticker_spill = ticker_spill
+        self._attach_models()
+        self._attach_ticker()
+        self.idx = Indexes(self.data)
+        self.ids = self._allocator()
+        # private RNG stream: runs are reproducible per seed and independent
+        # of any other universe in the same process
+        self.rng = random.Random(self.data["universe"].get("rng_seed", 42) if seed is None else seed)
+        self.version = 0
+        self.timeline = Timeline()   # fw.timeline week snapshots
+        self.calendar = None         # fw.logic.universe.Calendar, built on first use
+        self.standings = None        # fw.logic.standings.Standings, built on first use
+        self.lock = None             # set by fw.shared when sessions share this universe
+        self.perf = {}               # fw.perf stats: week -> timers/counters
+        self.view_cache = {}         # fw.views: key -> value, for one version
+        self.export_cache = {}       # export_universe: format -> payload, for one version
+        self.mark_clean()
+        self.full_dirty = True       # nothing persisted yet
+
+    def reseed(self, seed):
+        self.rng.seed(seed)
+
+    def load(self, data):
+        # replace contents in place so existing references to .data stay valid
+        self.data.clear(); self.data.update(data)
+        self._attach_models()
+        self._attach_ticker()
+        self.idx = Indexes(self.data)
+        self.ids = self._allocator()
+        self.timeline = Timeline()   # history restarts with the loaded state
+        self.calendar = None
+        self.standings = None
+        self.touch_all()
+
+    # ---------- change tracking ----------
+    # Every mutation goes through touch()/touch_all(): version bumps, and the
+    # touched keys are what the next incremental save (fw.journal) writes.
+    # Kept in touch order, so a replayed save inserts new entities in the
+    # order the live universe did.
+    def touch(self, coll, key=None):
+        self.version += 1
+        keys = self.dirty.get(coll)
+        if keys is None: keys = self.dirty[coll] = {}
+        keys[key] = None
+        self.timeline.note(coll, key)
+
+    def touch_all(self):
+        self.version += 1
+        self.full_dirty = True
+
+    def mark_clean(self, token=None):
+        """Called by a store once it holds this state. The dirty set is shared by
+        every store, so each remembers the clean_token it synced: a store whose
+        token is not the current one missed changes and must write in full.
+        Pass another universe's token when taking over its state unchanged."""
+        self.clean_token = token or object()
+        self.dirty = {}
+        self.full_dirty = False
+        self.emp_mark = len(self.data["employment"])
+        self.tick_mark = self.data["ticker"].appended
+
+    def _allocator(self):
+        ids = IdAllocator()
+        for coll in ("federations", "workers", "shows", "matches"):
+            for k in self.data[coll]: ids.observe(k)
+        for e in self.data["ticker"].events: ids.observe(e["id"])
+        return ids
+
+    def _attach_models(self):
+        # JSON dicts -> slotted records (fw.models); records already attached pass through
+        with gc_paused():
+            for coll, model in (("shows", Show), ("matches", Match)):
+                c = self.data[coll]
+                for k, v in c.items():
+                    if not isinstance(v, model): c[k] = model.of(v)
+
+    def _attach_ticker(self):
+        t = self.data.get("ticker")
+        if not isinstance(t, Ticker):
+            with gc_paused(): self.data["ticker"] = Ticker(reversed(t or []), spill_path=self.ticker_spill)
+
+    @classmethod
+    def from_json(cls, text, **kw):
+        return cls(_parse_universe_json(text), **kw)
+
+_current = contextvars.ContextVar("fw_universe", default=None)
+
+def use(u):
+    _current.set(u); return u
+
+@contextmanager
+def bound(u):
+    token = _current.set(u)
+    try: yield u
+    finally: _current.reset(token)
+
+def universe():
+    u = _current.get()
+    return u if u is not None else use(Universe())
+
+def state(): return universe().data
+def idx(): return universe().idx
+def rng(): return universe().rng
+
+def touch(coll, key=None): universe().touch(coll, key)
+def new_id(prefix): return universe().ids.new(prefix)
+
+def rebuild_indexes():
+    u = universe(); u.idx = Indexes(u.data)
+    return u.idx
+
+@perf.timed("db.add_ticker")
+def add_ticker(event_type, headline=None, blurb=None, severity=2, confidence=1.0, entities=None):
+    """Append a news event. Types in fw.models.TEMPLATES are stored without
+    text (pass their ids via `entities`); headline/blurb render on read."""
+    u = universe(); db = u.data
+    u.version += 1
+    perf.count("events_emitted")
+    db["ticker"].append(Event.new(u.ids.new("evt"), event_type, db["universe"]["current_week"], severity, confidence,
+                                  entities, headline, blurb))
+
+def ticker(): return state()["ticker"]
+def ticker_recent(n=6): return ticker().recent(n)
+def ticker_query(**kw): return ticker().query(**kw)
 
 def clamp(v, lo, hi): return max(lo, min(hi, v))
-def current_week(): return st.session_state.db["universe"]["current_week"]
+def current_week(): return state()["universe"]["current_week"]
 
 # ---------- Save/Load ----------
-def export_universe_json() -> str:
-    ss(); return json.dumps(st.session_state.db, indent=2)
+@contextmanager
+def gc_paused():
+    """Bulk loads allocate millions of acyclic objects; left on, the cyclic GC
+    would rescan the whole growing heap every few thousand of them."""
+    was_on = gc.isenabled(); gc.disable()
+    try: yield
+    finally:
+        if was_on: gc.enable()
 
-def import_universe_json(text: str):
-    data = json.loads(text)
+def _parse_universe_json(text):
+    """Parse an exported universe; `text` may also be the raw bytes of a plain or gzipped export."""
+    if isinstance(text, (bytes, bytearray)):
+        text = (gzip.decompress(text) if text[:2] == b"\x1f\x8b" else text).decode("utf-8")
+    with gc_paused(): data = json.loads(text)
     if not isinstance(data, dict) or "universe" not in data or "federations" not in data:
         raise ValueError("Invalid universe JSON (missing keys).")
-    st.session_state.db = data
+    return data
+
+def _json_default(o):
+    if isinstance(o, Record): return o.to_dict()
+    if isinstance(o, Ticker): return o.to_list()
+    if isinstance(o, ChainMap): return dict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+@perf.timed("db.export_universe_json")
+def export_universe_json(compact=False) -> str:
+    with gc_paused():
+        if compact: return json.dumps(state(), separators=(",", ":"), default=_json_default)
+        return json.dumps(state(), indent=2, default=_json_default)
+
+# download formats: name -> (file name, mime type)
+EXPORT_FORMATS = {
+    "json": ("universe.json", "application/json"),
+    "compact": ("universe.min.json", "application/json"),
+    "gzip": ("universe.json.gz", "application/gzip"),
+}
+
+def export_universe(fmt="json", build=True):
+    """Export payload as bytes: indented JSON, compact JSON, or compact JSON gzipped.
+
+    Cached on the universe until the next mutation (Universe.version), so
+    asking again costs nothing. build=False only returns a cached payload
+    (None if there is none for this version).
+    """
+    u = universe(); c = u.export_cache
+    if c.get("version") != u.version:   # any mutation drops every payload
+        c.clear(); c["version"] = u.version
+    if fmt not in c and build:
+        raw = export_universe_json(compact=fmt != "json").encode("utf-8")
+        c[fmt] = gzip.compress(raw, 6) if fmt == "gzip" else raw
+    return c.get(fmt)
+
+@perf.timed("db.import_universe_json")
+def import_universe_json(text):
+    universe().load(_parse_universe_json(text))
     add_ticker("UNIVERSE_IMPORT", "Universe imported", "Loaded from JSON file.", severity=1)
 
 # ---------- Seed ----------
 def seed_demo():
-    ss()
-    st.session_state.db = {
-        "universe": {"name": "Universe 0", "current_week": 1, "rng_seed": 42, "archived": False},
-        "federations": {}, "workers": {}, "employment": [],
-        "shows": {}, "matches": {}, "ticker": []
-    }
-    db = st.session_state.db
-    random.seed(db["universe"]["rng_seed"])
+    universe().load(empty_db())
+    db = state()
+    rng().seed(db["universe"]["rng_seed"])
 
     # Federations
     feds = [
@@ -83,10 +281,10 @@ def seed_demo():
         wid = new_id("w")
         db["workers"][wid] = {
             "id": wid, "ring_name": nm, "style": sty,
-            "alignment": random.choice(["face","heel","neutral"]),
-            "skill": random.randint(50,90), "charisma": random.randint(40,95),
-            "prestige": random.randint(20,80), "risk": random.randint(10,50),
-            "bio_short": "", "gender": random.choice(GENDERS)
+            "alignment": rng().choice(["face","heel","neutral"]),
+            "skill": rng().randint(50,90), "charisma": rng().randint(40,95),
+            "prestige": rng().randint(20,80), "risk": rng().randint(10,50),
+            "bio_short": "", "gender": rng().choice(GENDERS)
         }
 
     # Employment: 4 per fed; masked if lucha
@@ -95,20 +293,20 @@ def seed_demo():
     for (fid, ws) in zip(db["federations"].keys(), slices):
         fed_style = db["federations"][fid]["style"]
         for wid in ws:
-            masked = (fed_style == "lucha") and (random.random() < 0.7)
-            db["employment"].append({"worker_id": wid, "fed_id": fid, "start_week": 1, "end_week": None, "masked": masked})
+            masked = (fed_style == "lucha") and (rng().random() < 0.7)
+            add_employment({"worker_id": wid, "fed_id": fid, "start_week": 1, "end_week": None, "masked": masked})
 
     # One show each @ wk1
     for fid, fed in db["federations"].items():
         sh = new_id("show")
-        db["shows"][sh] = {"id": sh, "federation_id": fid, "name": f"{fed['name']} Weekly #1",
-                           "scheduled_week": 1, "status":"upcoming", "weirdness_snapshot":15}
+        add_show({"id": sh, "federation_id": fid, "name": f"{fed['name']} Weekly #1",
+                  "scheduled_week": 1, "status":"upcoming", "weirdness_snapshot":15})
 
     add_ticker("UNIVERSE_INIT", "Universe 0 initialized", "Demo feds/workers seeded.", severity=1)
 
 # ---------- CRUD ----------
-def create_fed(name, style, popularity, safety, liquidity, about, allow_intergender=None, allow_tag=None, allow_trios=None):
-    ss()
+def create_fed(name, style, popularity, safety, liquidity, about, allow_intergender=None, allow_tag=None, allow_trios=None,
+               card_length=None, ppv_every=None):
     fid = new_id("fed")
     f = {
         "id": fid, "name": name, "style": style, "popularity": popularity,
@@ -117,38 +315,105 @@ def create_fed(name, style, popularity, safety, liquidity, about, allow_intergen
         "allow_tag": bool(allow_tag if allow_tag is not None else (style in ("sports_ent","hardcore","lucha"))),
         "allow_trios": bool(allow_trios if allow_trios is not None else (style in ("lucha",)))
     }
-    st.session_state.db["federations"][fid] = f
+    if card_length: f["card_length"] = int(card_length)
+    if ppv_every: f["ppv_every"] = int(ppv_every)   # weeks between PPVs (fw.logic.universe.recurring)
+    state()["federations"][fid] = f
+    touch("federations", fid)
     add_ticker("FED_CREATED", f"Federation created: {name}", "", severity=1)
     return fid
 
 def create_worker(ring_name, style, alignment, skill, charisma, prestige, risk, bio, gender):
-    ss()
     wid = new_id("w")
-    st.session_state.db["workers"][wid] = {
+    state()["workers"][wid] = {
         "id": wid, "ring_name": ring_name, "style": style, "alignment": alignment,
         "skill": skill, "charisma": charisma, "prestige": prestige, "risk": risk,
         "bio_short": bio, "gender": gender
     }
+    touch("workers", wid)
     add_ticker("WORKER_CREATED", f"Worker created: {ring_name}", f"Gender: {gender}", severity=1)
     return wid
 
+def add_employment(e):
+    state()["employment"].append(e)
+    idx().add_employment(e)
+    touch("employment")
+
 def employ_worker(worker_id, fed_id, start_week=None, masked=False):
-    ss()
     if start_week is None: start_week = current_week()
-    st.session_state.db["employment"].append({
+    add_employment({
         "worker_id": worker_id, "fed_id": fed_id, "start_week": start_week, "end_week": None, "masked": bool(masked)
     })
-    w = st.session_state.db['workers'][worker_id]['ring_name']
-    f = st.session_state.db['federations'][fed_id]['name']
+    w = state()['workers'][worker_id]['ring_name']
+    f = state()['federations'][fed_id]['name']
     add_ticker("EMPLOYMENT", f"Hired: {w} → {f}", "Masked" if masked else "Unmasked")
 
+def add_show(show):
+    perf.count("shows_scheduled")
+    show = Show.of(show)
+    u = universe()
+    u.data["shows"][show.id] = show
+    u.idx.add_show(show)
+    if u.calendar is not None: u.calendar.add(show)
+    u.touch("shows", show.id)
+    return show.id
+
+def update(coll, key, **changes):
+    """Replace an entity with an updated copy; never mutate in place, since
+    timeline snapshots and forked branches share the old object."""
+    u = universe(); c = u.data[coll]
+    old = c[key]
+    new = c[key] = old._replace(**changes) if isinstance(old, Record) else {**old, **changes}
+    u.touch(coll, key)
+    return new
+
+def set_show_status(show_id, status):
+    u = universe()
+    old = u.data["shows"][show_id].status
+    if old == status: return
+    u.idx.move_show(update("shows", show_id, status=status), old)
+
+def add_match(match):
+    perf.count("matches_booked")
+    match = Match.of(match)
+    state()["matches"][match.id] = match
+    idx().add_match(match)
+    touch("matches", match.id)
+    return match.id
+
 # ---------- Queries ----------
-def fed_employed_workers(fid, week=None):
-    ss(); db = st.session_state.db
+def employment_active(e, week):
+    return (e["end_week"] is None or e["end_week"]>=week) and e["start_week"]<=week
+
+def employment_for_worker(wid):
+    return idx().emp_by_worker.get(wid, [])
+
+def employment_for_fed(fid):
+    return idx().emp_by_fed.get(fid, [])
+
+def employed_worker_ids(fid, week=None):
     week = week or current_week()
-    ids = {e["worker_id"] for e in db["employment"]
-           if e["fed_id"]==fid and (e["end_week"] is None or e["end_week"]>=week) and e["start_week"]<=week}
-    return [{"id": wid, **db["workers"][wid]} for wid in ids]
+    return list({e["worker_id"]: None for e in employment_for_fed(fid) if employment_active(e, week)})
+
+@perf.timed("db.fed_employed_workers")
+def fed_employed_workers(fid, week=None):
+    workers = state()["workers"]
+    return [{"id": wid, **workers[wid]} for wid in employed_worker_ids(fid, week)]
+
+def shows_for_week(week, status=None):
+    db = state(); ix = idx()
+    by_status = ix.shows_by_week.get(week, {})
+    if status is not None:
+        return [db["shows"][sid] for sid in by_status.get(status, {})]
+    return [db["shows"][sid] for ids in by_status.values() for sid in ids]
+
+def shows_with_status(status):
+    db = state()
+    return [db["shows"][sid] for sid in idx().shows_by_status.get(status, {})]
+
+def shows_for_fed(fid):
+    db = state()
+    return [db["shows"][sid] for sid in idx().shows_by_fed.get(fid, [])]
 
-def shows_for_week(week):
-    ss(); return [s for s in st.session_state.db["shows"].values() if s["scheduled_week"]==week]
+def matches_for_show(show_id):
+    db = state()
+    return sorted([db["matches"][mid] for mid in idx().matches_by_show.get(show_id, [])], key=lambda x: x.order)
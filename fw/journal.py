@@ -0,0 +1,110 @@
+"""Journaled incremental persistence.
+
+Two files per save target:
+  path            compact snapshot (plain universe JSON, no indent)
+  path.journal    append-only JSONL; one line per save holding the ops since
+                  the previous save
+
+Ops written per save come from Universe change tracking (touch()):
+  ["put", coll, key, value]   entity in federations/workers/shows/matches
+  ["meta", value]             the "universe" header (week, name, seed)
+  ["emp", [records]]          employment records appended since last save
+  ["tick", [events]]          ticker events appended since last save (oldest first)
+
+So a save costs O(changes). Loading reads the snapshot and replays the tail;
+a torn last line (crash mid-write) is ignored, and the next save writes a
+fresh snapshot rather than appending behind it. The journal is folded into a
+new snapshot when it outgrows the snapshot or after `compact_every` saves.
+
+Every snapshot carries a generation (GEN_KEY) that the journal repeats on its
+first line (["gen", g]); a journal from another generation - left behind by a
+crash between replacing the snapshot and truncating the journal - is ignored.
+A store only appends to a journal it wrote or loaded itself, for the universe
+state it last synced (Universe.clean_token); anything else gets a snapshot.
+"""
+import json, os, time
+from fw.db import Universe, _json_default
+
+ENTITY_COLLS = ("federations", "workers", "shows", "matches")
+GEN_KEY = "journal_gen"
+
+def _dumps(o): return json.dumps(o, separators=(",", ":"), default=_json_default)
+
+def pending_ops(u):
+    """Ops describing every change to `u` since its last save (see module doc)."""
+    d = u.data; ops = []
+    for coll, keys in u.dirty.items():
+        if coll in ENTITY_COLLS:
+            ops += [["put", coll, k, d[coll][k]] for k in keys if k in d[coll]]
+        elif coll == "universe":
+            ops.append(["meta", d["universe"]])
+    if len(d["employment"]) > u.emp_mark: ops.append(["emp", d["employment"][u.emp_mark:]])
+    ticks = d["ticker"].since(u.tick_mark)
+    if ticks: ops.append(["tick", ticks])
+    return ops
+
+class JournalStore:
+    def __init__(self, path, compact_every=200):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.saves_since_snapshot = 0
+        self.synced = None   # clean_token of the universe state these files hold
+
+    def in_sync(self, u):
+        """True if these files hold `u` as of its last mark_clean, so its dirty set is exactly what they lack."""
+        return (self.synced is u.clean_token and not u.full_dirty
+                and os.path.exists(self.path) and os.path.exists(self.journal_path))
+
+    # ---------- write ----------
+    def save(self, u):
+        """Persist everything changed since the last save. Returns bytes written."""
+        if not self.in_sync(u): return self.snapshot(u)
+        ops = pending_ops(u)
+        if not ops: return 0
+        line = _dumps(ops) + "\n"
+        with open(self.journal_path, "a", encoding="utf-8") as fh: fh.write(line)
+        u.mark_clean(); self.synced = u.clean_token
+        self.saves_since_snapshot += 1
+        if (self.saves_since_snapshot >= self.compact_every
+                or os.path.getsize(self.journal_path) > os.path.getsize(self.path)):
+            self.snapshot(u)
+        return len(line)
+
+    def snapshot(self, u):
+        """Write a compact snapshot and start a new, empty journal generation."""
+        gen = time.time_ns()
+        text = _dumps({**u.data, GEN_KEY: gen})
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh: fh.write(text)
+        os.replace(tmp, self.path)
+        # a crash here leaves the old journal, whose generation no longer matches
+        with open(self.journal_path, "w", encoding="utf-8") as fh: fh.write(_dumps([["gen", gen]]) + "\n")
+        u.mark_clean(); self.synced = u.clean_token
+        self.saves_since_snapshot = 0
+        return len(text)
+
+    # ---------- read ----------
+    def load(self, **universe_kw):
+        with open(self.path, encoding="utf-8") as fh: d = json.load(fh)
+        gen = d.pop(GEN_KEY, None)   # None: saved before generations, journal has no header either
+        ticks, current = [], os.path.exists(self.journal_path)
+        if current:
+            with open(self.journal_path, encoding="utf-8") as fh:
+                for i, line in enumerate(fh):
+                    try: ops = json.loads(line)
+                    except json.JSONDecodeError:          # torn tail: appending after it would
+                        current = False; break            # hide every later line from the next load
+                    if i == 0:
+                        current = (ops[0][1] if ops and ops[0][0] == "gen" else None) == gen
+                        if not current: break            # journal of an older snapshot
+                    for op in ops:
+                        if op[0] == "put": d[op[1]][op[2]] = op[3]
+                        elif op[0] == "meta": d["universe"] = op[1]
+                        elif op[0] == "emp": d["employment"].extend(op[1])
+                        elif op[0] == "tick": ticks.extend(op[1])
+        d["ticker"] = ticks[::-1] + d["ticker"]   # saved ticker is newest first
+        u = Universe(d, **universe_kw)
+        u.mark_clean()
+        if current: self.synced = u.clean_token   # else (stale or torn journal) the next save rewrites both files
+        return u
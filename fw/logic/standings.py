@@ -0,0 +1,122 @@
+"""Standings: win/loss records, streaks, federation rankings and title lineage.
+
+Derived state like fw.db.Indexes: built from match history on first use
+(`standings()`), then kept current by fw.sim.engine as each bout resolves,
+and never saved. Lookups never walk db["matches"]:
+
+    standings().record("w_12")            # O(1)
+    standings().top("fed_3", 10)          # O(k) slice of a sorted ranking
+    standings().champion(("fed_3", "singles"))
+
+Rankings are per federation (only bouts fought there count), ordered by
+wins, then fewest losses. Title bouts crown their winners: a different
+winning side starts a new reign, the same side adds a defense.
+"""
+from bisect import bisect_left, insort
+from fw.db import universe
+
+DIVISIONS = {1: "singles", 2: "tag", 3: "trios"}   # team size -> title division
+
+def title_name(fed, division):
+    return f"{fed['name']} " + {"singles": "World Title", "tag": "Tag Team Titles", "trios": "Trios Titles"}[division]
+
+class Standings:
+    def __init__(self):
+        self.workers = {}     # worker_id -> [wins, losses, streak]  (streak > 0 wins in a row, < 0 losses)
+        self.teams = {}       # sorted tuple of worker_ids -> [wins, losses, streak]
+        self.fed = {}         # (fed_id, worker_id) -> [wins, losses]
+        self.ranking = {}     # fed_id -> sorted [(-wins, losses, worker_id)]
+        self.reigns = {}      # (fed_id, division) -> [reign dict], oldest first
+
+    # ---------- updates ----------
+    def add_result(self, m, fed_id, week):
+        r = m.result
+        if r and not r.get("canceled"): self.add(fed_id, week, r["winners"], r["losers"], m.is_title_match, m.show_id)
+
+    def add(self, fed_id, week, winners, losers, title=False, show_id=None):
+        workers, teams = self.workers, self.teams
+        for side, won in ((winners, True), (losers, False)):
+            for wid in side:
+                rec = workers.get(wid)
+                if rec is None: rec = workers[wid] = [0, 0, 0]
+                _bump(rec, won)
+                self._rank(fed_id, wid, won)
+            if len(side) > 1:
+                key = tuple(sorted(side)); rec = teams.get(key)
+                if rec is None: rec = teams[key] = [0, 0, 0]
+                _bump(rec, won)
+        if title: self._crown((fed_id, DIVISIONS.get(len(winners), "singles")), winners, week, show_id)
+
+    def _rank(self, fid, wid, won):
+        rec = self.fed.get((fid, wid))
+        ranks = self.ranking.get(fid)
+        if ranks is None: ranks = self.ranking[fid] = []
+        if rec is None: rec = self.fed[(fid, wid)] = [0, 0]
+        else: del ranks[bisect_left(ranks, (-rec[0], rec[1], wid))]
+        rec[0 if won else 1] += 1
+        insort(ranks, (-rec[0], rec[1], wid))
+
+    def _crown(self, title, winners, week, show_id):
+        reigns = self.reigns.setdefault(title, [])
+        cur = reigns[-1] if reigns and reigns[-1]["lost_week"] is None else None
+        if cur and set(cur["holders"]) == set(winners):
+            cur["defenses"] += 1
+            return
+        if cur: cur["lost_week"] = week
+        reigns.append({"holders": list(winners), "won_week": week, "won_show": show_id, "lost_week": None, "defenses": 0})
+
+    # ---------- queries ----------
+    def record(self, wid):
+        w, l, s = self.workers.get(wid, (0, 0, 0))
+        return {"wins": w, "losses": l, "streak": s}
+
+    def team_record(self, ids):
+        w, l, s = self.teams.get(tuple(sorted(ids)), (0, 0, 0))
+        return {"wins": w, "losses": l, "streak": s}
+
+    def top(self, fid, n=10):
+        """[(worker_id, wins, losses)] best first."""
+        return [(wid, -w, l) for w, l, wid in self.ranking.get(fid, [])[:n]]
+
+    def rank(self, fid, wid):
+        """1-based rank in the federation, or None if unranked there."""
+        rec = self.fed.get((fid, wid))
+        return bisect_left(self.ranking[fid], (-rec[0], rec[1], wid)) + 1 if rec else None
+
+    def titles(self, fid):
+        return sorted(t for t in self.reigns if t[0] == fid)
+
+    def champion(self, title):
+        reigns = self.reigns.get(title)
+        return reigns[-1]["holders"] if reigns and reigns[-1]["lost_week"] is None else None
+
+    def lineage(self, title): return list(self.reigns.get(title, []))
+
+def _bump(rec, won):
+    rec[0 if won else 1] += 1
+    rec[2] = (rec[2] + 1 if rec[2] > 0 else 1) if won else (rec[2] - 1 if rec[2] < 0 else -1)
+
+def rebuild(data):
+    """Replay every resolved bout in calendar order (week, show creation, match order)."""
+    st = Standings()
+    shows = data["shows"]
+    by_show = {}
+    for m in data["matches"].values():
+        if m["result"]: by_show.setdefault(m["show_id"], []).append(m)
+    seq = {sid: i for i, sid in enumerate(shows)}
+    for sid in sorted(by_show, key=lambda sid: (shows[sid]["scheduled_week"], seq[sid]) if sid in shows else (0, -1)):
+        show = shows.get(sid)
+        if show is None: continue
+        for m in sorted(by_show[sid], key=lambda m: m.order):
+            st.add_result(m, show["federation_id"], show["scheduled_week"])
+    return st
+
+def standings():
+    u = universe()
+    if u.standings is None: u.standings = rebuild(u.data)
+    return u.standings
+
+def on_result(m, show, winners, losers):
+    """Engine hook: fold one resolved bout in, if standings have been built."""
+    st = universe().standings
+    if st is not None: st.add(show.federation_id, show.scheduled_week, winners, losers, m.is_title_match, show.id)
@@ -1,29 +1,90 @@
-import random, streamlit as st
-from fw.db import add_ticker
+"""Calendar and time flow.
 
+The Calendar keeps a week-ordered heap of upcoming shows and per-federation
+show counters, so rolling a week over costs O(shows due + federations), not
+O(history). It is derived state like fw.db.Indexes: built from the shows on
+first use, kept current by fw.db.add_show, never saved. Status changes need
+no hook - stale heap entries are skipped when they surface.
+"""
+import heapq
+from fw import perf
+from fw.db import universe, state, touch, add_ticker, add_show, shows_for_week, set_show_status, gc_paused
+from fw.models import Show
+
+# recurring show kinds: kind -> name template; a fed's cadence comes from recurring()
+SHOW_NAMES = {"weekly": "{fed} Weekly #{n}", "ppv": "{fed} PPV #{n}"}
+
+def recurring(fed):
+    """(kind, every n weeks) schedules a federation runs: weekly TV, plus a PPV if `ppv_every` is set."""
+    out = [("weekly", 1)]
+    if fed.get("ppv_every"): out.append(("ppv", int(fed["ppv_every"])))
+    return out
+
+class Calendar:
+    def __init__(self, shows):
+        self.heap = []        # (scheduled_week, show_id) of upcoming shows
+        self.counts = {}      # (fed_id, kind) -> shows ever scheduled
+        for s in shows.values(): self.add(s)
+
+    def add(self, s):   # s: fw.models.Show
+        key = (s.federation_id, s.extra.get("kind", "weekly") if s.extra else "weekly")
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if s.status == "upcoming": heapq.heappush(self.heap, (s.scheduled_week, s.id))
+
+    def overdue(self, week):
+        """Pop the shows still upcoming from before `week`."""
+        shows, out = state()["shows"], []
+        while self.heap and self.heap[0][0] < week:
+            wk, sid = heapq.heappop(self.heap)
+            s = shows.get(sid)
+            if s is not None and s.status == "upcoming" and s.scheduled_week == wk: out.append(s)
+        return out
+
+def calendar():
+    u = universe()
+    if u.calendar is None: u.calendar = Calendar(u.data["shows"])
+    return u.calendar
+
+@perf.timed("universe.schedule_weekly_if_missing")
 def schedule_weekly_if_missing(next_week):
-    db = st.session_state.db
-    by_fed = {}
-    for s in db["shows"].values():
-        by_fed.setdefault(s["federation_id"], set()).add(s["scheduled_week"])
-    for fid, fed in db["federations"].items():
-        if next_week not in by_fed.get(fid, set()):
-            sh = __import__("fw.util.ids", fromlist=["new_id"]).new_id("show")
-            num = sum(1 for s in db["shows"].values() if s["federation_id"]==fid) + 1
-            db["shows"][sh] = {"id": sh, "federation_id": fid, "name": f"{fed['name']} Weekly #{num}",
-                               "scheduled_week": next_week, "status":"upcoming",
-                               "weirdness_snapshot": max(0, min(100, random.randint(10,25) + fed["popularity"]//10))}
+    """Schedule every recurring show due in `next_week` that is not on the books yet."""
+    u = universe(); cal = calendar(); randint = u.rng.randint
+    booked = {(s.federation_id, s.get("kind", "weekly")) for s in shows_for_week(next_week)}
+    with gc_paused():   # see skip_time
+        for fid, fed in u.data["federations"].items():
+            for kind, every in recurring(fed):
+                if next_week % every or (fid, kind) in booked: continue
+                name = SHOW_NAMES[kind].format(fed=fed["name"], n=cal.counts.get((fid, kind), 0) + 1)
+                weird = max(0, min(100, randint(10,25) + fed["popularity"]//10))
+                show = Show.new(u.ids.new("show"), fid, name, next_week, weird)
+                if kind != "weekly": show.extra = {"kind": kind}
+                add_show(show)
 
+@perf.timed("universe.skip_time")
 def skip_time():
-    db = st.session_state.db
+    # a rollover allocates a record per postponed/scheduled show and event, all
+    # kept by the timeline: collect once afterwards, not every 700 allocations
+    with gc_paused(): _skip_time()
+
+def _skip_time():
+    db = state()
     wk = db["universe"]["current_week"]
     # postpone overdue
-    for s in db["shows"].values():
-        if s["scheduled_week"] < wk and s["status"]=="upcoming":
-            s["status"] = "postponed"
-            add_ticker("SHOW_POSTPONED", f"Show postponed: {s['name']}", "", severity=2, entities={"show_id": s["id"]})
+    for s in calendar().overdue(wk):
+        set_show_status(s.id, "postponed")
+        add_ticker("SHOW_POSTPONED", severity=2, entities={"show_id": s.id})
     # advance
     db["universe"]["current_week"] += 1
+    touch("universe")
     new_wk = db["universe"]["current_week"]
     schedule_weekly_if_missing(new_wk)
-    add_ticker("SCHEDULE_ROLLOVER", f"Advanced to Week {new_wk}", "Weekly shows scheduled.")
+    add_ticker("SCHEDULE_ROLLOVER")
+    # start-of-week snapshot for time travel / what-if branches (fw.timeline)
+    universe().timeline.capture(db, new_wk)
+
+@perf.timed("universe.fast_forward")
+def fast_forward(weeks):
+    """Skip `weeks` weeks without running cards; each week costs what it schedules
+    and postpones, independent of how much history the universe holds."""
+    for _ in range(weeks): skip_time()
+    return state()["universe"]["current_week"]
@@ -1,3 +1,235 @@
-# Minimal placeholder; expand with dataclasses/enums later if you like
+"""Entity models.
+
+Federations and workers are plain dicts. Shows, matches and ticker events -
+the collections that grow with every simulated week - are slotted records:
+no per-instance dict, no duplicated keys, and no stored prose. Recaps,
+headlines, blurbs and timestamps are rendered on demand from the ids and
+enums a record keeps, using the active universe for names.
+
+Records read like the dicts they replace (m["result"], m.get("teams"),
+"teams" in m, dict(m)) and serialize to the same JSON layout, so saves
+round-trip both ways. They are immutable by convention: fw.db.update()
+swaps in a replaced copy.
+"""
+import datetime, sys, time
+
 FED_STYLES = ["sports_ent", "hardcore", "mma", "lucha", "shoot"]
 GENDERS = ["male", "female", "nonbinary"]
+METHODS = ["pinfall", "submission", "KO/TKO", "judges' decision"]
+CANCEL_REASON = "Injury in camp"
+# canonical string objects: loaded results share them instead of holding one copy per match
+_ENUMS = {s: s for s in METHODS + [CANCEL_REASON]}
+_NO_ENTITIES = {}
+
+class Record:
+    __slots__ = ("extra",)
+    FIELDS = ()          # JSON keys stored in same-named slots, in JSON order
+    DERIVED = ()         # JSON keys a subclass maps onto its private slots
+
+    def __init_subclass__(cls):
+        cls.KNOWN = frozenset(cls.FIELDS + cls.DERIVED)
+
+    # of()/to_dict() are spelled out per class: a generic loop over FIELDS
+    # made loading a long history several times slower.
+    @classmethod
+    def _extra(cls, d):
+        """Keys this model has no slot for (kept so saves round-trip)."""
+        return None if d.keys() <= cls.KNOWN else {k: v for k, v in d.items() if k not in cls.KNOWN}
+
+    def _replace(self, **changes):
+        r = object.__new__(type(self))
+        for k in self.FIELDS: object.__setattr__(r, k, changes.pop(k) if k in changes else getattr(self, k))
+        r.extra = {**(self.extra or {}), **changes} or None
+        return r
+
+    # ---------- dict-style reads ----------
+    # Keys are the JSON keys only (KNOWN + extra), never methods or private
+    # slots. Hot internal code reads attributes (s.status) instead.
+    def __getitem__(self, k):
+        if k in self.KNOWN: return getattr(self, k)
+        ex = self.extra
+        if ex and k in ex: return ex[k]
+        raise KeyError(k)
+
+    def __getattr__(self, k):   # only reached for keys that are not fields
+        ex = object.__getattribute__(self, "extra")
+        if ex and k in ex: return ex[k]
+        raise AttributeError(k)
+
+    def get(self, k, default=None):
+        if k in self.KNOWN: return getattr(self, k)
+        ex = self.extra
+        return ex.get(k, default) if ex else default
+    def __contains__(self, k): return k in self.KNOWN or bool(self.extra and k in self.extra)
+    def keys(self): return self.to_dict().keys()
+    def __iter__(self): return iter(self.keys())
+    def __repr__(self): return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Show(Record):
+    __slots__ = ("id", "federation_id", "name", "scheduled_week", "status", "weirdness_snapshot")
+    FIELDS = __slots__
+
+    @classmethod
+    def of(cls, d):
+        """Show from its JSON dict (records pass through)."""
+        if isinstance(d, cls): return d
+        r = cls.__new__(cls); g = d.get
+        r.id, r.federation_id, r.name, r.scheduled_week = d["id"], d["federation_id"], g("name", ""), d["scheduled_week"]
+        r.status, r.weirdness_snapshot, r.extra = g("status", "upcoming"), g("weirdness_snapshot", 0), cls._extra(d)
+        return r
+
+    @classmethod
+    def new(cls, id, federation_id, name, scheduled_week, weirdness_snapshot=0, status="upcoming", **extra):
+        r = cls.__new__(cls)
+        r.id, r.federation_id, r.name, r.scheduled_week = id, federation_id, name, scheduled_week
+        r.status, r.weirdness_snapshot, r.extra = status, weirdness_snapshot, extra or None
+        return r
+
+    def _replace(self, **changes):
+        # spelled out too: every status change copies the show
+        r = Show.__new__(Show)
+        r.id, r.federation_id, r.name, r.scheduled_week = self.id, self.federation_id, self.name, self.scheduled_week
+        r.status, r.weirdness_snapshot, r.extra = self.status, self.weirdness_snapshot, self.extra
+        for k, v in changes.items():
+            if k in Show.FIELDS: setattr(r, k, v)
+            else: r.extra = {**(r.extra or {}), k: v}
+        return r
+
+    def to_dict(self):
+        d = {"id": self.id, "federation_id": self.federation_id, "name": self.name,
+             "scheduled_week": self.scheduled_week, "status": self.status, "weirdness_snapshot": self.weirdness_snapshot}
+        if self.extra: d.update(self.extra)
+        return d
+
+class Match(Record):
+    # participants are stored only when they are not simply the teams concatenated;
+    # recap_text only for saves that predate on-demand recaps
+    __slots__ = ("id", "show_id", "order", "stipulation", "is_title_match", "teams", "result", "_participants", "_recap")
+    FIELDS = __slots__[:7]
+    DERIVED = ("participants", "recap_text")
+
+    @classmethod
+    def of(cls, d):
+        """Match from its JSON dict (records pass through)."""
+        if isinstance(d, cls): return d
+        r = cls.__new__(cls); g = d.get
+        teams, parts, res = g("teams"), g("participants"), g("result")
+        if teams: teams = [[sys.intern(p) for p in t] for t in teams]
+        r.id, r.show_id, r.order, r.teams = d["id"], d["show_id"], g("order", 0), teams
+        r.stipulation, r.is_title_match = g("stipulation", "Standard"), g("is_title_match", False)
+        r.result = _compact_result(res) if res else res
+        r._participants = None if teams and parts == [p for t in teams for p in t] else parts
+        r._recap, r.extra = g("recap_text") or None, cls._extra(d)
+        return r
+
+    def _replace(self, **changes):
+        r = super()._replace(**{k: v for k, v in changes.items() if k not in self.DERIVED})
+        r._participants = changes.get("participants", self._participants)
+        r._recap = changes.get("recap_text", self._recap)
+        return r
+
+    @property
+    def participants(self):
+        if self._participants is not None: return self._participants
+        return [p for t in self.teams for p in t] if self.teams else []
+
+    @property
+    def recap_text(self):
+        if self._recap is not None: return self._recap
+        r = self.result
+        if not r: return ""
+        if r.get("canceled"): return "Bout canceled due to injury."
+        return f"{_names(r['winners'])} defeated {_names(r['losers'])} by {r['method']} at {r['time_s']}s."
+
+    def to_dict(self):
+        d = {"id": self.id, "show_id": self.show_id, "order": self.order, "stipulation": self.stipulation,
+             "is_title_match": self.is_title_match, "participants": self.participants, "teams": self.teams,
+             "result": self.result, "recap_text": self._recap or ""}
+        if self.extra: d.update(self.extra)
+        return d
+
+def _compact_result(r):
+    r = dict(r)
+    for k in ("method", "reason"):
+        if k in r: r[k] = _ENUMS.get(r[k], r[k])
+    for k in ("winners", "losers"):
+        if k in r: r[k] = [sys.intern(p) for p in r[k]]
+    return r
+
+# ---------- ticker events ----------
+def _db():
+    from fw.db import state   # names come from whichever universe is bound
+    return state()
+
+def _names(ids, sep=", "):
+    ws = _db()["workers"]
+    return sep.join(ws[i]["ring_name"] if i in ws else i for i in ids)
+
+def _show(e):
+    sid = e.entities.get("show_id"); shows = _db()["shows"]
+    return shows[sid]["name"] if sid in shows else (sid or "?")
+
+def _result(e):
+    m = _db()["matches"].get(e.entities.get("match_id"))
+    r = m["result"] if m else None
+    return (_names(r["winners"]), _names(r["losers"]), r["method"]) if r and not r.get("canceled") else ("?", "?", "?")
+
+# type -> (headline, blurb) renderers for events stored without text
+TEMPLATES = {
+    "MATCH_RESULT": (lambda e: "{} def. {} by {}".format(*_result(e)), lambda e: f"Event: {_show(e)}"),
+    "MATCH_CANCELED": (lambda e: f"Match canceled on {_show(e)}", lambda e: f"{CANCEL_REASON}."),
+    "SHOW_COMPLETED": (lambda e: f"Show completed: {_show(e)}", lambda e: ""),
+    "SHOW_POSTPONED": (lambda e: f"Show postponed: {_show(e)}", lambda e: ""),
+    "BOOKING_UPDATE": (lambda e: f"No matches available for {_show(e)}", lambda e: "Roster too thin?"),
+    "SCHEDULE_NOTE": (lambda e: f"No shows scheduled for Week {e.week}", lambda e: ""),
+    "SCHEDULE_ROLLOVER": (lambda e: f"Advanced to Week {e.week}", lambda e: "Weekly shows scheduled."),
+}
+
+class Event(Record):
+    __slots__ = ("id", "t", "type", "severity", "confidence", "entities", "week", "_headline", "_blurb")
+    FIELDS = ("id", "type", "severity", "confidence", "entities", "week")
+    DERIVED = ("ts", "headline", "blurb")
+
+    @classmethod
+    def new(cls, id, type, week, severity=2, confidence=1.0, entities=None, headline=None, blurb=None):
+        e = cls.__new__(cls)
+        e.id, e.t, e.type, e.week, e.severity, e.confidence = id, time.time(), type, week, severity, confidence
+        e.entities = entities or _NO_ENTITIES
+        e._headline, e._blurb, e.extra = headline, blurb, None
+        return e
+
+    @classmethod
+    def of(cls, d):
+        """Event from its JSON dict (records pass through); stored text is kept."""
+        if isinstance(d, cls): return d
+        e = cls.__new__(cls); g = d.get
+        ts = g("ts")
+        e.id, e.type, e.week, e.severity, e.confidence = d["id"], d["type"], d["week"], g("severity", 2), g("confidence", 1.0)
+        e.entities = g("entities") or _NO_ENTITIES
+        e.t = datetime.datetime.fromisoformat(ts.rstrip("Z")).replace(tzinfo=datetime.timezone.utc).timestamp() if ts else 0.0
+        e._headline, e._blurb, e.extra = g("headline"), g("blurb"), cls._extra(d)
+        return e
+
+    def _render(self, i, stored):
+        if stored is not None: return stored
+        tpl = TEMPLATES.get(self.type)
+        return tpl[i](self) if tpl else ""
+
+    @property
+    def headline(self): return self._render(0, self._headline)
+    @property
+    def blurb(self): return self._render(1, self._blurb)
+    @property
+    def ts(self):
+        return datetime.datetime.fromtimestamp(self.t, datetime.timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+    def to_dict(self):
+        d = {"id": self.id, "ts": self.ts, "type": self.type, "severity": self.severity,
+             "confidence": self.confidence, "entities": self.entities, "week": self.week}
+        if self._headline is not None: d["headline"] = self._headline
+        if self._blurb is not None: d["blurb"] = self._blurb
+        if self.extra: d.update(self.extra)
+        return d
+
+    def _replace(self, **changes):
+        raise TypeError("ticker events are append-only")
@@ -0,0 +1,56 @@
+"""Hot-path instrumentation: call counts, cumulative time and counters per
+simulated week, stored on the active Universe (`u.perf`, not saved).
+
+Off by default. While off, a @timed function costs one flag check and
+count() returns immediately. Times are inclusive (run_card includes its
+run_match calls).
+"""
+import functools, json, time
+
+enabled = False
+
+def enable(on=True):
+    global enabled
+    enabled = bool(on)
+
+def _bucket():
+    from fw.db import universe
+    u = universe()
+    return u.perf.setdefault(u.data["universe"]["current_week"], {"timers": {}, "counters": {}})
+
+def timed(name):
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not enabled: return fn(*a, **kw)
+            b = _bucket()   # attribute to the week the call started in
+            t0 = time.perf_counter()
+            try: return fn(*a, **kw)
+            finally:
+                t = b["timers"].setdefault(name, [0, 0.0])
+                t[0] += 1; t[1] += time.perf_counter() - t0
+        return wrapper
+    return deco
+
+def count(name, n=1):
+    if not enabled: return
+    c = _bucket()["counters"]
+    c[name] = c.get(name, 0) + n
+
+def report(u=None):
+    """{week: {"timers": {name: {"calls", "total_ms", "avg_ms"}}, "counters": {...}}}"""
+    if u is None:
+        from fw.db import universe
+        u = universe()
+    return {wk: {"timers": {n: {"calls": c, "total_ms": s*1e3, "avg_ms": s*1e3/c if c else 0.0}
+                            for n, (c, s) in sorted(b["timers"].items(), key=lambda x: -x[1][1])},
+                 "counters": dict(b["counters"])}
+            for wk, b in sorted(u.perf.items())}
+
+def to_json(u=None): return json.dumps(report(u), indent=2)
+
+def reset(u=None):
+    if u is None:
+        from fw.db import universe
+        u = universe()
+    u.perf.clear()
@@ -0,0 +1,72 @@
+"""Headless runner: simulate weeks without Streamlit.
+
+    python -m fw.run --load universe.json --weeks 520 --out result.json
+    python -m fw.run --seed-demo --weeks 52 --out demo.json
+    python -m fw.run --resume league.json --weeks 52 --journal league.json
+    python -m fw.run --load big.fwc --weeks 52 --out big.fwc     # columnar (fw.colstore)
+    python -m fw.run --load big.json.gz --weeks 52 --out big.json.gz   # compact, gzipped JSON
+"""
+import argparse, sys, time
+from fw.db import Universe, use, seed_demo, export_universe
+from fw import perf
+from fw.journal import JournalStore
+from fw.colstore import ColumnStore
+from fw.sim.engine import simulate_weeks
+
+def load_universe(path, **universe_kw):
+    """The universe saved at `path` (what --load accepts): .fwc, or plain or gzipped JSON."""
+    if path.endswith(".fwc"): return ColumnStore(path).load(**universe_kw)
+    with open(path, "rb") as fh: return Universe.from_json(fh.read(), **universe_kw)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m fw.run", description="Run Federation Wars weeks headless.")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--load", metavar="PATH", help="universe JSON (or .fwc) to start from")
+    src.add_argument("--resume", metavar="PATH", help="journaled save to start from (snapshot + journal tail)")
+    src.add_argument("--seed-demo", action="store_true", help="start from the demo seed")
+    ap.add_argument("--weeks", type=int, default=1, help="weeks to simulate (default 1)")
+    ap.add_argument("--seed", type=int, default=None, help="RNG seed")
+    ap.add_argument("--batch", action="store_true", help="resolve each week's matches vectorized (NumPy)")
+    ap.add_argument("--ticker-spill", metavar="PATH", help="spill old ticker events to this JSONL segment")
+    ap.add_argument("--journal", metavar="PATH", help="save incrementally to PATH (+ PATH.journal) after every week")
+    ap.add_argument("--perf", metavar="PATH", help="instrument hot paths and write per-week stats JSON here")
+    ap.add_argument("--out", metavar="PATH", help="write the resulting universe JSON (.json.gz: compact, gzipped; or .fwc) here")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.load:
+        u = use(load_universe(args.load, ticker_spill=args.ticker_spill))
+    elif args.resume:
+        resumed = JournalStore(args.resume)
+        u = use(resumed.load(ticker_spill=args.ticker_spill))
+    else:
+        u = use(Universe(ticker_spill=args.ticker_spill)); seed_demo()
+    if args.seed is not None: u.reseed(args.seed)
+
+    perf.enable(bool(args.perf))
+    t0 = time.perf_counter()
+    start_wk = u.data["universe"]["current_week"]
+    # same files as --resume: only append; any other target starts with a full snapshot
+    store = (resumed if args.resume and args.resume == args.journal else
+             JournalStore(args.journal) if args.journal else None)
+    simulate_weeks(args.weeks, batch=args.batch, on_week=(lambda _: store.save(u)) if store else None)
+    dt = time.perf_counter() - t0
+
+    if args.out and args.out.endswith(".fwc"):
+        ColumnStore(args.out).save(u)
+    elif args.out:
+        with open(args.out, "wb") as fh:
+            fh.write(export_universe("gzip" if args.out.endswith(".gz") else "json"))
+    if args.perf:
+        with open(args.perf, "w", encoding="utf-8") as fh:
+            fh.write(perf.to_json(u))
+    if not args.quiet:
+        d = u.data
+        print(f"weeks {start_wk}→{d['universe']['current_week']} in {dt:.2f}s "
+              f"({args.weeks/dt if dt else 0:.1f} weeks/s) • feds {len(d['federations'])} • "
+              f"workers {len(d['workers'])} • shows {len(d['shows'])} • matches {len(d['matches'])}",
+              file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
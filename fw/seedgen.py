@@ -0,0 +1,108 @@
+"""Synthetic universe generator for large, reproducible test worlds.
+
+    python -m fw.seedgen --feds 500 --workers 50000 --history 104 --weeks 4 --seed 7 --out big.json
+
+Builds the raw db dict directly (no per-entity ticker events or index
+updates) and hands it to a Universe once, so 50k workers take seconds.
+Same seed, same arguments -> identical universe, ids included.
+"""
+import argparse, json, random, sys
+from fw.db import empty_db, universe, _json_default
+from fw.models import FED_STYLES, GENDERS
+from fw.util.ids import IdAllocator
+
+FIRST = ["El", "Big", "The", "Kid", "Mad", "Iron", "Lady", "Doctor", "Crown", "Killer", "Silent", "Golden",
+         "Rowdy", "Mister", "Ms.", "Captain", "Baron", "Lucky", "Wild", "Neon"]
+LAST = ["Vortex", "Nightmare", "Tiger", "Anvil", "Voltage", "Nebula", "Shark", "Cobra", "Hammer", "Phantom",
+        "Blaze", "Titan", "Comet", "Raven", "Cyclone", "Viper", "Falcon", "Bulldozer", "Specter", "Jaguar"]
+PLACES = ["Steel City", "Pacific", "Northern", "Midwest", "Global", "Lone Star", "Empire", "Coastal",
+          "Atlantic", "Desert", "Harbor", "Metro", "Sunset", "Frontier", "Capital"]
+KINDS = {"sports_ent": "Wrestling Entertainment", "hardcore": "Hardcore Wrestling", "mma": "Fighting Championship",
+         "lucha": "Lucha Libre", "shoot": "Shoot Style"}
+
+def generate_universe(feds=50, workers=1000, history=0, weeks=1, seed=0, roster_turnover=0.3, name="Generated"):
+    """Return a db dict with `feds` federations and `workers` workers.
+
+    history: weeks already elapsed (current week = history + 1); workers get
+             employment stints spread over them, `roster_turnover` of them with
+             an earlier job at another federation.
+    weeks:   upcoming weekly shows scheduled per federation from the current week.
+    """
+    r = random.Random(seed); ids = IdAllocator()
+    d = empty_db()
+    cur = history + 1
+    d["universe"].update(name=name, current_week=cur, rng_seed=seed)
+
+    fids = []
+    for i in range(feds):
+        style = r.choice(FED_STYLES); fid = ids.new("fed"); fids.append(fid)
+        d["federations"][fid] = {
+            "id": fid, "name": f"{r.choice(PLACES)} {KINDS[style]} {i+1}", "style": style,
+            "popularity": r.randint(10, 90), "safety": r.randint(10, 95),
+            "liquidity": r.randrange(20_000, 1_000_000, 10_000), "about": "",
+            "allow_intergender": style in ("hardcore","lucha","sports_ent"),
+            "allow_tag": style in ("sports_ent","hardcore","lucha"),
+            "allow_trios": style in ("lucha",)
+        }
+
+    emp = d["employment"]
+    for i in range(workers):
+        wid = ids.new("w")
+        d["workers"][wid] = {
+            "id": wid, "ring_name": f"{r.choice(FIRST)} {r.choice(LAST)} {to_roman(i // 400 + 1)}".rstrip(),
+            "style": r.choice(FED_STYLES), "alignment": r.choice(["face","heel","neutral"]),
+            "skill": r.randint(30,95), "charisma": r.randint(30,95),
+            "prestige": r.randint(5,90), "risk": r.randint(5,60),
+            "bio_short": "", "gender": r.choice(GENDERS)
+        }
+        if not fids: continue
+        fid = fids[i % feds] if i < feds*2 else r.choice(fids)   # every fed gets at least two workers
+        start = 1
+        if history and r.random() < roster_turnover:
+            start = r.randint(2, cur)
+            prev = r.choice(fids)
+            emp.append({"worker_id": wid, "fed_id": prev, "start_week": 1, "end_week": start - 1,
+                        "masked": d["federations"][prev]["style"] == "lucha" and r.random() < 0.7})
+        emp.append({"worker_id": wid, "fed_id": fid, "start_week": start, "end_week": None,
+                    "masked": d["federations"][fid]["style"] == "lucha" and r.random() < 0.7})
+
+    for fid in fids:
+        fed = d["federations"][fid]
+        for n, wk in enumerate(range(cur, cur + weeks), start=1):
+            sid = ids.new("show")
+            d["shows"][sid] = {"id": sid, "federation_id": fid, "name": f"{fed['name']} Weekly #{n}",
+                               "scheduled_week": wk, "status": "upcoming",
+                               "weirdness_snapshot": max(0, min(100, r.randint(10,25) + fed["popularity"]//10))}
+    return d
+
+def to_roman(n):
+    if n == 1: return ""
+    out = ""
+    for v, s in ((100, "C"), (90, "XC"), (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")):
+        while n >= v: out += s; n -= v
+    return out
+
+def seed_generated(**kw):
+    """Replace the active universe with a generated one (cf. fw.db.seed_demo)."""
+    u = universe()
+    u.load(generate_universe(**kw))
+    u.reseed(kw.get("seed", 0))
+    return u
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m fw.seedgen", description="Generate a large synthetic universe.")
+    ap.add_argument("--feds", type=int, default=50)
+    ap.add_argument("--workers", type=int, default=1000)
+    ap.add_argument("--history", type=int, default=0, help="weeks already elapsed")
+    ap.add_argument("--weeks", type=int, default=1, help="upcoming weeks of shows to schedule")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", required=True, metavar="PATH")
+    args = ap.parse_args(argv)
+    d = generate_universe(args.feds, args.workers, args.history, args.weeks, args.seed)
+    with open(args.out, "w", encoding="utf-8") as fh: json.dump(d, fh, default=_json_default)
+    print(f"{len(d['federations'])} feds • {len(d['workers'])} workers • {len(d['employment'])} employment "
+          f"• {len(d['shows'])} shows → {args.out}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
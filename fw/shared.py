@@ -0,0 +1,65 @@
+"""Process-wide shared universes ("leagues").
+
+By default every browser session owns a private Universe. A league is one
+Universe held by the process and bound by every session that joins it, so
+memory scales with leagues, not viewers, and everyone sees the same state.
+
+Sessions read the shared Universe directly, without copying. Writes go
+through `League.write(seen)`, which holds the league lock and checks
+optimistically that nobody else changed the universe since the writer last
+looked at it (`Universe.version`); otherwise it raises StaleVersion and
+changes nothing. View builds (fw.views) take the same lock, since they
+iterate whole collections.
+
+    store = LeagueStore()
+    league = store.get("main")
+    with league.write(seen=v) as u: ...   # StaleVersion if u.version != v
+
+Headless like the rest of fw/; fw.st_state keeps one LeagueStore per process
+via st.cache_resource.
+"""
+import threading
+from contextlib import contextmanager
+from fw.db import Universe, bound
+from fw.ticker import spill_path, discard_with
+
+class StaleVersion(Exception):
+    """The shared universe changed since the writer last saw it."""
+    def __init__(self, seen, current):
+        super().__init__(f"universe changed since you loaded it (version {seen} -> {current})")
+        self.seen, self.current = seen, current
+
+class League:
+    def __init__(self, name, u):
+        self.name = name
+        self.u = u
+        u.lock = self.lock = threading.RLock()
+        self.job = None   # the league's fw.sim.background.SimJob, visible to every session
+
+    @contextmanager
+    def write(self, seen=None):
+        """Exclusive write block; `seen` is the version the writer's view was built from."""
+        with self.lock:
+            if seen is not None and self.u.version != seen: raise StaleVersion(seen, self.u.version)
+            with bound(self.u): yield self.u
+
+    def busy(self): return self.job is not None and self.job.running
+
+class LeagueStore:
+    def __init__(self):
+        self.leagues = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """The league called `name`, created empty on first use."""
+        with self._lock:
+            lg = self.leagues.get(name)
+            if lg is None:
+                spill = spill_path("league")   # deleted with the universe, once dropped and unused
+                lg = self.leagues[name] = League(name, discard_with(Universe(ticker_spill=spill), spill))
+            return lg
+
+    def names(self): return sorted(self.leagues)
+
+    def drop(self, name):
+        with self._lock: return self.leagues.pop(name, None) is not None
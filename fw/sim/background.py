@@ -0,0 +1,102 @@
+"""Multi-week simulation on a background thread.
+
+The job simulates a private working copy, never the live universe, so
+pages can keep rerunning (and reading) while it works. The copy is cheap:
+entities are copy-on-write (fw.db.update), so only the collection dicts
+are copied, not the entities. When the job ends, publish() - called from
+the UI/script thread - swaps the results into the live universe in one
+step, unless that universe was changed in the meantime.
+
+    job = SimJob(u, weeks=52).start()
+    job.progress()              # (weeks done, weeks asked)
+    job.cancel()                # stops after the current week
+    if job.finished: job.publish()
+"""
+import copy, threading, traceback
+from fw.db import Universe, use
+from fw.ticker import Ticker
+from fw.sim.engine import simulate_weeks
+
+COPIED = ("federations", "workers", "shows", "matches")
+
+class SimJob:
+    def __init__(self, u, weeks, batch=False):
+        self.target = u
+        self.weeks = weeks
+        self.batch = batch
+        self.done = 0
+        self.error = None
+        self.published = False
+        self._stop = threading.Event()
+        self._thread = None
+        # working copy, taken on the caller's thread while nothing else writes
+        self.base_version = u.version
+        self._data = {c: dict(u.data[c]) for c in COPIED}
+        self._data["universe"] = dict(u.data["universe"])
+        self._data["employment"] = list(u.data["employment"])
+        self._data["ticker"] = Ticker(window=float("inf"))   # new events only, merged on publish
+        self._ids = copy.deepcopy(u.ids)
+        self._rng = u.rng.getstate()
+        self._timeline = u.timeline.copy()
+        self.work = None
+
+    # ---------- control ----------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="fw-sim", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._stop.set()
+
+    @property
+    def running(self): return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def finished(self): return self._thread is not None and not self._thread.is_alive()
+
+    @property
+    def canceled(self): return self._stop.is_set()
+
+    def progress(self): return self.done, self.weeks
+
+    def _run(self):
+        try:
+            w = Universe(self._data)   # indexes rebuilt here, off the UI thread
+            w.ids = self._ids; w.rng.setstate(self._rng); w.timeline = self._timeline
+            self.work = use(w)         # threads start with an empty context: bind explicitly
+            simulate_weeks(self.weeks, on_week=self._on_week, batch=self.batch)
+        except _Stop:
+            pass
+        except Exception:
+            self.error = traceback.format_exc()
+
+    def _on_week(self, n):
+        self.done = n
+        if self._stop.is_set(): raise _Stop()
+
+    # ---------- results ----------
+    def publish(self):
+        """Swap the finished weeks into the live universe (script thread only).
+
+        Returns False if there is nothing to publish: the job failed (its
+        last week may be half-applied), finished no week, or the live
+        universe changed since it started - its results would overwrite those
+        changes, so they are dropped instead. Either way a finished job is
+        marked published, so callers stop waiting on it.
+        """
+        if self.published or not self.finished: return False
+        self.published = True
+        u, w = self.target, self.work
+        if self.error or w is None or not self.done or u.version != self.base_version: return False
+        for c in COPIED + ("universe", "employment"): u.data[c] = w.data[c]
+        for e in w.data["ticker"].events: u.data["ticker"].append(e)
+        u.idx, u.ids, u.timeline, u.calendar = w.idx, w.ids, w.timeline, w.calendar
+        u.standings = w.standings   # None unless the job built them: rebuilt on next use
+        u.rng.setstate(w.rng.getstate())
+        for wk, b in w.perf.items(): u.perf[wk] = b
+        u.touch_all()
+        return True
+
+class _Stop(Exception):
+    """Raised between weeks to end a canceled job."""
@@ -0,0 +1,100 @@
+"""Vectorized resolution of a whole week's matches (optional NumPy).
+
+Same model as engine.run_match, drawn column-wise: per-worker skill/charisma/
+prestige arrays, STYLE_FIT as a style x style matrix, and one RNG draw per
+quantity for every match at once. Outcomes follow the scalar distributions
+but not the scalar RNG sequence, so a given seed gives different (equally
+likely) results on the two paths.
+"""
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from fw import perf
+from fw.db import state, rng, add_ticker, matches_for_show
+from fw.models import FED_STYLES
+from fw.sim.booking import STYLE_FIT, ensure_card
+from fw.sim import engine
+
+STYLES = list(FED_STYLES)
+_STYLE_IDX = {s: i for i, s in enumerate(STYLES)}
+UNKNOWN_STYLE = len(STYLES)  # row/col of 1.0 for styles STYLE_FIT doesn't list
+
+def style_matrix():
+    fit = np.ones((len(STYLES)+1, len(STYLES)+1))
+    for fs, row in STYLE_FIT.items():
+        for ws, v in row.items():
+            if fs in _STYLE_IDX and ws in _STYLE_IDX: fit[_STYLE_IDX[fs], _STYLE_IDX[ws]] = v
+    return fit
+
+def resolve_team_matches(matches, fed_styles):
+    """Score team matches in one pass.
+
+    Returns (canceled, win_idx, method_idx, time_s) arrays aligned with matches.
+    """
+    db = state(); workers = db["workers"]
+    col = {}  # worker_id -> column
+    for m in matches:
+        for team in m["teams"]:
+            for wid in team: col.setdefault(wid, len(col))
+    ws = [workers[wid] for wid in col]
+    base = (0.6*np.fromiter((w["skill"] for w in ws), float, len(ws))
+            + 0.3*np.fromiter((w["charisma"] for w in ws), float, len(ws))
+            + 0.1*np.fromiter((w["prestige"] for w in ws), float, len(ws)))
+    wstyle = np.fromiter((_STYLE_IDX.get(w["style"], UNKNOWN_STYLE) for w in ws), int, len(ws))
+
+    n = len(matches)
+    k = max((len(t) for m in matches for t in m["teams"]), default=1)
+    members = np.full((n, 2, k), -1, dtype=int)
+    for i, m in enumerate(matches):
+        for side, team in enumerate(m["teams"][:2]):
+            members[i, side, :len(team)] = [col[wid] for wid in team]
+    fstyle = np.fromiter((_STYLE_IDX.get(s, UNKNOWN_STYLE) for s in fed_styles), int, n)
+    can_cancel = np.fromiter((s in engine.CANCEL_STYLES for s in fed_styles), bool, n)
+
+    g = np.random.default_rng(rng().getrandbits(64))
+    canceled = can_cancel & (g.random(n) < engine.CANCEL_P)
+    present = members >= 0
+    cols = np.where(present, members, 0)
+    star = base[cols]*style_matrix()[fstyle[:, None, None], wstyle[cols]] + g.integers(-10, 11, size=(n, 2, k))
+    team = (star*present).sum(axis=2) / np.maximum(1, present.sum(axis=2)) + g.uniform(-3, 3, size=(n, 2))
+    win_idx = np.where(team[:, 0] >= team[:, 1], 0, 1)
+    method = g.integers(0, len(engine.METHODS), size=n)
+    time_s = g.integers(240, 1501, size=n)
+    return canceled, win_idx, method, time_s
+
+@perf.timed("batch.run_cards_batch")
+def run_cards_batch(show_ids):
+    """Book and run several shows, resolving their team matches together."""
+    if np is None:
+        for sid in show_ids: engine.run_card(sid)
+        return
+    db = state()
+    cards = []
+    for sid in show_ids:
+        ensure_card(sid)
+        cards.append((db["shows"][sid], matches_for_show(sid)))
+
+    vec, styles = [], []
+    for show, ms in cards:
+        fed_style = db["federations"][show["federation_id"]]["style"]
+        for m in ms:
+            if m.get("teams"): vec.append(m); styles.append(fed_style)
+    out = {}
+    if vec:
+        canceled, win_idx, method, time_s = resolve_team_matches(vec, styles)
+        for i, m in enumerate(vec):
+            out[m["id"]] = (bool(canceled[i]), int(win_idx[i]), engine.METHODS[method[i]], int(time_s[i]))
+
+    for show, ms in cards:
+        if not ms:
+            add_ticker("BOOKING_UPDATE", severity=2, entities={"show_id": show["id"]})
+            continue
+        for m in ms:
+            r = out.get(m["id"])
+            if r is None: engine.run_match(m["id"]); continue   # legacy 1v1 without teams
+            was_canceled, w, method, t = r
+            if was_canceled: engine.record_cancel(m, show)
+            else: engine.record_team_result(m, show, m["teams"][w], m["teams"][1-w], method, t)
+        engine.complete_show(show)
@@ -1,7 +1,8 @@
-import random
-import streamlit as st
-from fw.db import fed_employed_workers
-from fw.util.ids import new_id
+from fw import perf
+from fw.db import state, new_id, rng, employed_worker_ids, matches_for_show, shows_for_week, add_match
+from fw.sim.matchmaking import build_card, DEFAULT_CARD_LENGTH
+
+PPV_EXTRA_MATCHES = 2   # PPV cards run longer than the fed's weekly card
 
 STYLE_FIT = {
     "sports_ent": {"sports_ent":1.15, "lucha":1.05, "shoot":0.95, "hardcore":1.00, "mma":0.90},
@@ -15,61 +16,44 @@ def style_fit(worker_style, fed_style):
     return STYLE_FIT.get(fed_style, {}).get(worker_style, 1.0)
 
 def star_score(wrk, fed_style):
-    base = 0.6*wrk["skill"] + 0.3*wrk["charisma"] + 0.1*wrk["prestige"]
-    return base * style_fit(wrk["style"], fed_style) + random.randint(-10,10)
-
-def ensure_card(show_id):
-    db = st.session_state.db
-    show = db["shows"][show_id]; fid = show["federation_id"]; fed = db["federations"][fid]
-    roster = fed_employed_workers(fid, show["scheduled_week"])
-
-    # (id, gender) pool minus already booked
-    pool = [(w["id"], db["workers"][w["id"]]["gender"]) for w in roster]
-    existing = [m for m in db["matches"].values() if m["show_id"]==show_id]
-    used = set(pid for m in existing for pid in m.get("participants", []))
-    pool = [(pid,g) for (pid,g) in pool if pid not in used]
-    if existing: return
-
-    def pick_recipe():
-        if fed["style"] == "mma": return [1,1]
-        choices = [[1,1]]*5
-        if fed.get("allow_tag"): choices += [[2,2]]*3
-        if fed.get("allow_trios"): choices += [[3,3]]*2
-        return random.choice(choices)
-
-    def can_form_team(k, pool_local, allow_inter):
-        if k<=0 or len(pool_local)<k: return None
-        if allow_inter: return random.sample(pool_local, k)
-        by_g = {}
-        for p in pool_local: by_g.setdefault(p[1], []).append(p)
-        genders = [g for g in by_g if len(by_g[g])>=k]
-        if not genders: return None
-        g = random.choice(genders); return random.sample(by_g[g], k)
-
-    def pop_ids(picks, pool_local):
-        ids = [pid for (pid,_) in picks]
-        return ids, [x for x in pool_local if x[0] not in ids]
-
-    matches = []
-    random.shuffle(pool)
-    for _ in range(4):
-        k = pick_recipe()[0]; allow_inter = fed.get("allow_intergender", True)
-        a = can_form_team(k, pool, allow_inter)
-        if not a: break
-        a_ids, pool = pop_ids(a, pool)
-        b = can_form_team(k, pool, allow_inter)
-        if not b:
-            pool += [(pid, db["workers"][pid]["gender"]) for pid in a_ids]; break
-        b_ids, pool = pop_ids(b, pool)
-        matches.append((a_ids, b_ids))
-
-    order = 1
-    for (a_ids, b_ids) in matches:
-        mid = new_id("match")
-        db["matches"][mid] = {
-            "id": mid, "show_id": show_id, "order": order,
-            "stipulation":"Standard", "is_title_match": False,
+    return rating(wrk, fed_style) + rng().randint(-10,10)
+
+def rating(wrk, fed_style):
+    """star_score without the nightly noise: what the matchmaker pairs on."""
+    return (0.6*wrk["skill"] + 0.3*wrk["charisma"] + 0.1*wrk["prestige"]) * style_fit(wrk["style"], fed_style)
+
+def write_card(show_id, card, title_main_event=False):
+    """title_main_event: the last (strongest) match is for the federation's title of its division."""
+    for order, (a_ids, b_ids) in enumerate(card, start=1):
+        add_match({
+            "id": new_id("match"), "show_id": show_id, "order": order,
+            "stipulation":"Standard", "is_title_match": title_main_event and order == len(card),
             "participants": a_ids+b_ids, "teams":[a_ids, b_ids],
-            "result": None, "recap_text": ""
-        }
-        order += 1
+            "result": None
+        })
+
+def _book(show, db, ratings):
+    fid = show["federation_id"]; fed = db["federations"][fid]
+    rated = ratings.get(fid)
+    if rated is None:   # one rating pass per federation per week
+        workers = db["workers"]
+        rated = ratings[fid] = [(wid, workers[wid]["gender"], rating(workers[wid], fed["style"]))
+                                for wid in employed_worker_ids(fid, show["scheduled_week"])]
+    length = fed.get("card_length") or DEFAULT_CARD_LENGTH
+    ppv = show.get("kind") == "ppv"
+    if ppv: length += PPV_EXTRA_MATCHES
+    write_card(show["id"], build_card(rated, fed, rng(), length), title_main_event=ppv)
+
+@perf.timed("booking.ensure_card")
+def ensure_card(show_id):
+    """Book a card for the show unless it already has matches."""
+    if matches_for_show(show_id): return
+    db = state()
+    _book(db["shows"][show_id], db, {})
+
+@perf.timed("booking.book_week")
+def book_week(week):
+    """Book every upcoming, unbooked show of `week` in one pass."""
+    db = state(); ratings = {}
+    for show in shows_for_week(week, "upcoming"):
+        if not matches_for_show(show["id"]): _book(show, db, ratings)
@@ -1,20 +1,37 @@
-import random, streamlit as st
-from fw.db import add_ticker, clamp
-from fw.sim.booking import star_score, ensure_card
+from fw.db import state, rng, update, add_ticker, clamp, matches_for_show, shows_for_week, set_show_status
+from fw.sim.booking import star_score, ensure_card, book_week
+from fw.models import METHODS, CANCEL_REASON
+from fw.logic import standings
+from fw import perf
 
+CANCEL_STYLES = ("mma","hardcore")
+CANCEL_P = 0.05
+
+# Results keep ids and enum strings only; recap and headline text render on
+# read (fw.models). Each resolved bout is folded into fw.logic.standings.
+def record_cancel(m, show):
+    perf.count("matches_canceled")
+    update("matches", m["id"], result={"canceled": True, "reason": CANCEL_REASON})
+    add_ticker("MATCH_CANCELED", severity=3, entities={"show_id": show["id"], "match_id": m["id"]})
+
+def record_team_result(m, show, winners, losers, method, time_s):
+    perf.count("matches_resolved")
+    update("matches", m["id"], result={"winners": winners, "losers": losers, "method": method, "time_s": time_s})
+    standings.on_result(m, show, winners, losers)
+    add_ticker("MATCH_RESULT", severity=2,
+               entities={"show_id": show["id"], "match_id": m["id"], "winner_ids": winners, "loser_ids": losers})
+
+@perf.timed("engine.run_match")
 def run_match(match_id):
-    db = st.session_state.db
+    db = state()
     m = db["matches"][match_id]
     show = db["shows"][m["show_id"]]
     fed = db["federations"][show["federation_id"]]
     fed_style = fed["style"]
 
     # Simple cancellation chance for MMA/Hardcore
-    if random.random() < 0.05 and fed_style in ("mma","hardcore"):
-        m["result"] = {"canceled": True, "reason": "Injury in camp"}
-        m["recap_text"] = "Bout canceled due to injury."
-        add_ticker("MATCH_CANCELED", f"Match canceled on {show['name']}", "Injury in camp.", severity=3,
-                   entities={"show_id": show["id"]})
+    if rng().random() < CANCEL_P and fed_style in CANCEL_STYLES:
+        record_cancel(m, show)
         return
 
     teams = m.get("teams")
@@ -23,13 +40,9 @@ def run_match(match_id):
         parts = [db["workers"][pid] for pid in m["participants"]]
         scored = sorted([(p["id"], star_score(p, fed_style)) for p in parts], key=lambda x: x[1], reverse=True)
         winner = scored[0][0]; loser = [pid for pid,_ in scored if pid != winner][0]
-        method = random.choice(["pinfall","submission","KO/TKO","judges' decision"])
-        time_s = random.randint(180, 1200)
-        m["result"] = {"winners":[winner], "losers":[loser], "method": method, "time_s": time_s}
-        wr = db["workers"][winner]["ring_name"]; lr = db["workers"][loser]["ring_name"]
-        m["recap_text"] = f"{wr} defeated {lr} by {method} at {time_s}s."
-        add_ticker("MATCH_RESULT", f"{wr} def. {lr} by {method}", f"Event: {show['name']}", severity=2,
-                   entities={"show_id": show["id"], "winner_id": winner, "loser_id": loser})
+        method = rng().choice(METHODS)
+        time_s = rng().randint(180, 1200)
+        record_team_result(m, show, [winner], [loser], method, time_s)
         return
 
     # team scoring
@@ -37,41 +50,56 @@ def run_match(match_id):
     for team in teams:
         members = [db["workers"][pid] for pid in team]
         s = sum(star_score(p, fed_style) for p in members) / max(1,len(members))
-        s += random.uniform(-3,3)
+        s += rng().uniform(-3,3)
         scores.append(s)
 
     win_idx = 0 if scores[0] >= scores[1] else 1
     winners = teams[win_idx]; losers = teams[1-win_idx]
-    method = random.choice(["pinfall","submission","KO/TKO","judges' decision"])
-    time_s = random.randint(240, 1500)
-    m["result"] = {"winners": winners, "losers": losers, "method": method, "time_s": time_s}
-    wnames = ", ".join([db["workers"][wid]["ring_name"] for wid in winners])
-    lnames = ", ".join([db["workers"][wid]["ring_name"] for wid in losers])
-    m["recap_text"] = f"{wnames} defeated {lnames} by {method} at {time_s}s."
-    add_ticker("MATCH_RESULT", f"{wnames} def. {lnames} by {method}",
-               f"Event: {show['name']}", severity=2,
-               entities={"show_id": show["id"], "winner_ids": winners, "loser_ids": losers})
+    method = rng().choice(METHODS)
+    time_s = rng().randint(240, 1500)
+    record_team_result(m, show, winners, losers, method, time_s)
 
+@perf.timed("engine.run_card")
 def run_card(show_id):
-    db = st.session_state.db
+    db = state()
     ensure_card(show_id)
     show = db["shows"][show_id]
-    matches = sorted([m for m in db["matches"].values() if m["show_id"]==show_id], key=lambda x: x["order"])
+    matches = matches_for_show(show_id)
     if not matches:
-        add_ticker("BOOKING_UPDATE", f"No matches available for {show['name']}", "Roster too thin?", severity=2)
+        add_ticker("BOOKING_UPDATE", severity=2, entities={"show_id": show_id})
         return
     for m in matches: run_match(m["id"])
-    show["status"] = "completed"
-    add_ticker("SHOW_COMPLETED", f"Show completed: {show['name']}", "", severity=2)
+    complete_show(show)
 
-def run_all_cards_this_week():
-    db = st.session_state.db
+def complete_show(show):
+    set_show_status(show["id"], "completed")
+    add_ticker("SHOW_COMPLETED", severity=2, entities={"show_id": show["id"]})
+
+@perf.timed("engine.run_all_cards_this_week")
+def run_all_cards_this_week(batch=False):
+    """Run every upcoming show of the current week.
+
+    batch=True resolves all of the week's team matches in one vectorized pass
+    (fw.sim.batch, needs NumPy; falls back to run_card without it).
+    """
+    db = state()
     wk = db["universe"]["current_week"]
-    todays = [s for s in db["shows"].values() if s["scheduled_week"]==wk and s["status"]=="upcoming"]
+    todays = shows_for_week(wk, "upcoming")
     if not todays:
-        add_ticker("SCHEDULE_NOTE", f"No shows scheduled for Week {wk}", "", severity=1)
+        add_ticker("SCHEDULE_NOTE", severity=1)
+    book_week(wk)
+    if batch and todays:
+        from fw.sim.batch import run_cards_batch
+        run_cards_batch([s["id"] for s in todays])
     for s in todays:
-        run_card(s["id"])
+        if not batch: run_card(s["id"])
         fed = db["federations"][s["federation_id"]]
-        delta = max(-3, min(3, random.randint(-2,3)))
-        fed["popularity"] = max(0, min(100, fed["popularity"] + delta))
+        delta = max(-3, min(3, rng().randint(-2,3)))
+        update("federations", fed["id"], popularity=max(0, min(100, fed["popularity"] + delta)))
+
+def simulate_weeks(weeks, on_week=None, batch=False):
+    from fw.logic.universe import skip_time
+    for i in range(weeks):
+        run_all_cards_this_week(batch=batch)
+        skip_time()
+        if on_week: on_week(i + 1)
@@ -0,0 +1,55 @@
+"""Card building: balanced pairings from gender buckets and rating tiers.
+
+Pure functions over (worker_id, gender, rating) tuples; fw.sim.booking
+supplies rosters and writes the matches. Per card: one sort of the pool
+(O(n log n)), then each match takes 2k rating-adjacent workers from a random
+tier of one bucket and snake-splits them into two teams, so opponents are
+close in quality while different tiers get booked from week to week.
+"""
+DEFAULT_CARD_LENGTH = 4
+
+def recipe_weights(fed):
+    """Team sizes a federation books, as a weighted list (same odds as the old builder)."""
+    if fed["style"] == "mma": return [1]
+    sizes = [1]*5
+    if fed.get("allow_tag"): sizes += [2]*3
+    if fed.get("allow_trios"): sizes += [3]*2
+    return sizes
+
+def buckets(pool, allow_intergender):
+    """Split (id, gender, rating) tuples into rating-sorted buckets; one shared bucket if intergender."""
+    ordered = sorted(pool, key=lambda p: p[2], reverse=True)
+    if allow_intergender: return [ordered]
+    by_g = {}
+    for p in ordered: by_g.setdefault(p[1], []).append(p)
+    return list(by_g.values())
+
+def snake_split(group):
+    """Rating-sorted 2k workers -> two teams of k with near-equal totals (ABBA order)."""
+    a, b = [], []
+    for i, p in enumerate(group):
+        (a if i % 4 in (0, 3) else b).append(p[0])
+    return a, b
+
+def build_card(pool, fed, rng, card_length=None):
+    """Return [(team_a_ids, team_b_ids), ...], weakest match first, main event last.
+
+    pool: (worker_id, gender, rating) for every bookable worker. Without
+    intergender, both teams of a match come from the same gender bucket.
+    """
+    card_length = card_length or fed.get("card_length") or DEFAULT_CARD_LENGTH
+    sizes = recipe_weights(fed)
+    bs = buckets(pool, fed.get("allow_intergender", True))
+    card = []
+    for _ in range(card_length):
+        k = rng.choice(sizes)
+        fits = [b for b in bs if len(b) >= 2*k]
+        while not fits and k > 1:          # roster too thin for this size: drop to a smaller match
+            k -= 1; fits = [b for b in bs if len(b) >= 2*k]
+        if not fits: break
+        b = rng.choice(fits)
+        i = rng.randrange(len(b) - 2*k + 1)
+        group = b[i:i+2*k]; del b[i:i+2*k]
+        card.append((sum(p[2] for p in group), snake_split(group)))
+    card.sort(key=lambda c: c[0])
+    return [teams for _, teams in card]
@@ -0,0 +1,127 @@
+"""Monte Carlo runner: N independent simulations of one universe.
+
+Every run gets its own Universe and its own random.Random(seed), so a seed's
+outcome does not depend on the pool size or on which process ran it. Workers
+send back per-chunk aggregates (win/loss counts, final popularity), never
+universe copies.
+
+    python -m fw.sim.montecarlo --load universe.json --runs 10000 --weeks 52 --out odds.json
+"""
+import argparse, json, os, sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from fw.db import Universe, bound, _parse_universe_json, export_universe_json
+from fw.sim.engine import simulate_weeks
+from fw.run import load_universe
+
+class MonteCarloStats:
+    def __init__(self):
+        self.runs = 0
+        self.wins = {}          # worker_id -> wins
+        self.bouts = {}         # worker_id -> decided bouts
+        self.top = {}           # fed_id -> worker_id -> runs finishing as the fed's winningest worker
+        self.popularity = {}    # fed_id -> [final popularity per run]
+
+    def add_run(self, start, data):
+        self.runs += 1
+        wins, bouts = {}, {}
+        for mid, m in data["matches"].items():
+            r = m["result"]
+            if mid in start or not r or r.get("canceled"): continue
+            for wid in r["winners"]:
+                wins[wid] = wins.get(wid, 0) + 1; bouts[wid] = bouts.get(wid, 0) + 1
+            for wid in r["losers"]:
+                bouts[wid] = bouts.get(wid, 0) + 1
+        for wid, n in wins.items(): self.wins[wid] = self.wins.get(wid, 0) + n
+        for wid, n in bouts.items(): self.bouts[wid] = self.bouts.get(wid, 0) + n
+        best = {}
+        for e in data["employment"]:
+            wid = e["worker_id"]; n = wins.get(wid, 0)
+            if e["end_week"] is None and n and n > best.get(e["fed_id"], (None, 0))[1]:
+                best[e["fed_id"]] = (wid, n)
+        for fid, (wid, _) in best.items():
+            t = self.top.setdefault(fid, {}); t[wid] = t.get(wid, 0) + 1
+        for fid, f in data["federations"].items():
+            self.popularity.setdefault(fid, []).append(f["popularity"])
+
+    def merge(self, other):
+        self.runs += other.runs
+        for wid, n in other.wins.items(): self.wins[wid] = self.wins.get(wid, 0) + n
+        for wid, n in other.bouts.items(): self.bouts[wid] = self.bouts.get(wid, 0) + n
+        for fid, t in other.top.items():
+            mine = self.top.setdefault(fid, {})
+            for wid, n in t.items(): mine[wid] = mine.get(wid, 0) + n
+        for fid, vals in other.popularity.items(): self.popularity.setdefault(fid, []).extend(vals)
+        return self
+
+    def summary(self, percentiles=(5, 25, 50, 75, 95)):
+        def pct(vals, p):
+            vals = sorted(vals); i = min(len(vals)-1, max(0, round(p/100*(len(vals)-1))))
+            return vals[i]
+        return {
+            "runs": self.runs,
+            "win_rate": {wid: self.wins.get(wid, 0)/n for wid, n in self.bouts.items() if n},
+            "top_worker_odds": {fid: {wid: n/self.runs for wid, n in t.items()} for fid, t in self.top.items()},
+            "popularity": {fid: {f"p{p}": pct(v, p) for p in percentiles} for fid, v in self.popularity.items()},
+        }
+
+# ---------- worker side ----------
+_base = None
+
+def _init(text):
+    global _base
+    _base = _parse_universe_json(text)
+
+def run_one(data, seed, weeks, stats=None):
+    stats = stats or MonteCarloStats()
+    u = Universe(json.loads(json.dumps(data)), seed=seed)
+    with bound(u):
+        simulate_weeks(weeks)
+    stats.add_run(data["matches"], u.data)
+    return stats
+
+def _run_chunk(seeds, weeks):
+    stats = MonteCarloStats()
+    for seed in seeds: run_one(_base, seed, weeks, stats)
+    return stats
+
+# ---------- driver ----------
+def run_many(text, runs, weeks=52, workers=None, chunk=50, base_seed=0):
+    """Yield (completed_runs, aggregate MonteCarloStats) as chunks finish."""
+    seeds = list(range(base_seed, base_seed + runs))
+    chunks = [seeds[i:i+chunk] for i in range(0, len(seeds), chunk)]
+    total = MonteCarloStats()
+    if workers == 1:
+        _init(text)
+        for c in chunks:
+            total.merge(_run_chunk(c, weeks)); yield total.runs, total
+        return
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init, initargs=(text,)) as ex:
+        for fut in as_completed([ex.submit(_run_chunk, c, weeks) for c in chunks]):
+            total.merge(fut.result()); yield total.runs, total
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m fw.sim.montecarlo", description="Monte Carlo outcome distributions.")
+    ap.add_argument("--load", required=True, metavar="PATH", help="universe to branch from (JSON, .json.gz or .fwc, as for fw.run)")
+    ap.add_argument("--runs", type=int, default=1000)
+    ap.add_argument("--weeks", type=int, default=52)
+    ap.add_argument("--workers", type=int, default=None, help="process count (default: CPU count)")
+    ap.add_argument("--chunk", type=int, default=50, help="runs per task")
+    ap.add_argument("--base-seed", type=int, default=0)
+    ap.add_argument("--out", metavar="PATH", help="write the summary JSON here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    # any format fw.run --load reads; workers get it back as compact JSON
+    with bound(load_universe(args.load)): text = export_universe_json(compact=True)
+    total = None
+    for done, total in run_many(text, args.runs, args.weeks, args.workers, args.chunk, args.base_seed):
+        print(f"\r{done}/{args.runs} runs", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    out = json.dumps(total.summary() if total else {}, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh: fh.write(out)
+    else:
+        print(out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
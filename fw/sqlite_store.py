@@ -0,0 +1,147 @@
+"""SQLite storage backend.
+
+Same save/load contract as fw.journal.JournalStore, backed by one SQLite file
+(WAL mode): federations, workers, employment, shows, matches and ticker are
+tables with a few identifying columns pulled out (for ad-hoc SQL), plus the
+full record as JSON in `doc`. A save bulk-rewrites the file unless it already
+holds exactly the universe state last synced by this store (see
+fw.journal); then only what changed (fw.journal.pending_ops) is upserted, in
+one transaction.
+
+Scope: this is a save backend only. load() materializes the whole universe
+in memory and the app's pages read that live universe; nothing pages rows in
+from SQLite, so memory is bounded no better than with a JSON save. JSON stays
+the interchange format:
+
+    python -m fw.sqlite_store import universe.json league.db
+    python -m fw.sqlite_store export league.db universe.json
+"""
+import json, sqlite3, sys
+from fw.db import Universe, _parse_universe_json, _json_default
+from fw.journal import pending_ops
+from fw.ticker import DEFAULT_WINDOW
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS federations (id TEXT PRIMARY KEY, name TEXT, style TEXT, popularity INTEGER, doc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, ring_name TEXT, style TEXT, gender TEXT, doc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS employment (seq INTEGER PRIMARY KEY, worker_id TEXT, fed_id TEXT,
+                                       start_week INTEGER, end_week INTEGER, masked INTEGER);
+CREATE TABLE IF NOT EXISTS shows (id TEXT PRIMARY KEY, federation_id TEXT, scheduled_week INTEGER, status TEXT,
+                                  doc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS matches (id TEXT PRIMARY KEY, show_id TEXT, ord INTEGER, doc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS ticker (seq INTEGER PRIMARY KEY, week INTEGER, type TEXT, severity INTEGER, doc TEXT NOT NULL);
+"""
+
+def _doc(o): return json.dumps(o, separators=(",", ":"), default=_json_default)
+
+def _upsert(table, cols):
+    # update in place: INSERT OR REPLACE would delete the row and re-insert it
+    # under a new rowid, and load() restores insertion order from the rowid
+    sets = ", ".join(f"{c}=excluded.{c}" for c in cols[1:])
+    return f"INSERT INTO {table} VALUES ({','.join('?' * len(cols))}) ON CONFLICT(id) DO UPDATE SET {sets}"
+
+# per-table row builders: entity dict -> INSERT parameters
+ROWS = {
+    "federations": (_upsert("federations", ("id", "name", "style", "popularity", "doc")),
+                    lambda f: (f["id"], f["name"], f["style"], f["popularity"], _doc(f))),
+    "workers": (_upsert("workers", ("id", "ring_name", "style", "gender", "doc")),
+                lambda w: (w["id"], w["ring_name"], w["style"], w.get("gender"), _doc(w))),
+    "shows": (_upsert("shows", ("id", "federation_id", "scheduled_week", "status", "doc")),
+              lambda s: (s["id"], s["federation_id"], s["scheduled_week"], s["status"], _doc(s))),
+    "matches": (_upsert("matches", ("id", "show_id", "ord", "doc")),
+                lambda m: (m["id"], m["show_id"], m["order"], _doc(m))),
+}
+EMP_SQL = "INSERT INTO employment (worker_id, fed_id, start_week, end_week, masked) VALUES (?,?,?,?,?)"
+TICK_SQL = "INSERT INTO ticker (week, type, severity, doc) VALUES (?,?,?,?)"
+
+def _emp_row(e): return (e["worker_id"], e["fed_id"], e["start_week"], e["end_week"], int(bool(e.get("masked"))))
+def _tick_row(e): return (e["week"], e["type"], e["severity"], _doc(e))
+
+class SqliteStore:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.synced = None   # clean_token of the universe state this file holds
+
+    def close(self): self.conn.close()
+
+    # ---------- write ----------
+    def save(self, u):
+        """Persist `u`: only its changes if this file holds its last synced state, else a bulk rewrite."""
+        if self.synced is u.clean_token and not u.full_dirty: self._write_ops(pending_ops(u))
+        else: self._write_all(u.data)
+        u.mark_clean(); self.synced = u.clean_token
+
+    def _write_all(self, d):
+        with self.conn:
+            for t in ("meta", "federations", "workers", "employment", "shows", "matches", "ticker"):
+                self.conn.execute(f"DELETE FROM {t}")
+            self.conn.execute("INSERT INTO meta VALUES ('universe', ?)", (_doc(d["universe"]),))
+            for coll, (sql, row) in ROWS.items():
+                self.conn.executemany(sql, map(row, d[coll].values()))
+            self.conn.executemany(EMP_SQL, map(_emp_row, d["employment"]))
+            events = d["ticker"] if isinstance(d["ticker"], list) else d["ticker"].to_list()   # newest first
+            self.conn.executemany(TICK_SQL, map(_tick_row, reversed(events)))
+
+    def _write_ops(self, ops):
+        with self.conn:
+            puts = {}
+            for op in ops:
+                if op[0] == "put": puts.setdefault(op[1], []).append(op[3])
+                elif op[0] == "meta": self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('universe', ?)", (_doc(op[1]),))
+                elif op[0] == "emp": self.conn.executemany(EMP_SQL, map(_emp_row, op[1]))
+                elif op[0] == "tick": self.conn.executemany(TICK_SQL, map(_tick_row, op[1]))
+            for coll, docs in puts.items():
+                sql, row = ROWS[coll]
+                self.conn.executemany(sql, map(row, docs))
+
+    # ---------- read ----------
+    def load(self, ticker_window=DEFAULT_WINDOW, **universe_kw):
+        """Materialize the universe in memory; only the newest ticker_window events are loaded."""
+        u = Universe(self._read(ticker_window), **universe_kw)
+        u.mark_clean(); self.synced = u.clean_token
+        return u
+
+    def _read(self, ticker_window):
+        """The stored universe as a plain JSON-shaped dict (ticker_window=-1: every event)."""
+        c = self.conn
+        row = c.execute("SELECT value FROM meta WHERE key='universe'").fetchone()
+        if row is None: raise ValueError(f"{self.path}: no universe stored")
+        d = {"universe": json.loads(row[0])}
+        for coll in ("federations", "workers", "shows", "matches"):
+            d[coll] = {r["id"]: r for r in (json.loads(doc) for (doc,) in c.execute(f"SELECT doc FROM {coll} ORDER BY rowid"))}
+        d["employment"] = [{"worker_id": w, "fed_id": f, "start_week": s, "end_week": e, "masked": bool(m)}
+                           for (w, f, s, e, m) in c.execute("SELECT worker_id, fed_id, start_week, end_week, masked "
+                                                            "FROM employment ORDER BY seq")]
+        d["ticker"] = [json.loads(doc) for (doc,) in
+                       c.execute("SELECT doc FROM ticker ORDER BY seq DESC LIMIT ?", (ticker_window,))]
+        return d
+
+    def count(self, table):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # ---------- JSON interchange ----------
+    def import_json(self, text):
+        self._write_all(_parse_universe_json(text))
+
+    def export_json(self):
+        # straight from the rows: a Universe would cut the ticker to its in-memory window
+        return json.dumps(self._read(ticker_window=-1), indent=2, default=_json_default)   # LIMIT -1: all rows
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] not in ("import", "export"):
+        print("usage: python -m fw.sqlite_store import UNIVERSE.json DB | export DB UNIVERSE.json", file=sys.stderr)
+        return 2
+    if argv[0] == "import":
+        with open(argv[1], encoding="utf-8") as fh: SqliteStore(argv[2]).import_json(fh.read())
+    else:
+        with open(argv[2], "w", encoding="utf-8") as fh: fh.write(SqliteStore(argv[1]).export_json())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
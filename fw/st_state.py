@@ -0,0 +1,96 @@
+import os
+from contextlib import contextmanager, nullcontext
+import streamlit as st
+from fw.db import Universe, use
+from fw.shared import LeagueStore, StaleVersion
+from fw.ticker import spill_path, discard_with
+
+# Streamlit adapter: each browser session owns one Universe, bound as the
+# active universe at the top of every script run. st.session_state.db stays
+# an alias of its data dict for page code.
+#
+# Shared mode (opt-in: ?league=NAME in the URL, or FW_LEAGUE=NAME for every
+# session) binds the process-wide league of that name instead (fw.shared).
+# Actions then mutate through write(), which fails politely if another
+# session changed the league since this one last rendered it.
+@st.cache_resource
+def league_store():
+    return LeagueStore()
+
+def league_name():
+    return st.query_params.get("league") or os.environ.get("FW_LEAGUE") or None
+
+def ss():
+    name = league_name()
+    if name:
+        lg = st.session_state.league = league_store().get(name)
+        st.session_state.universe = lg.u
+    else:
+        if st.session_state.get("league") is not None:   # left a league: back to a private universe
+            st.session_state.league = None; st.session_state.pop("universe", None)
+        if "universe" not in st.session_state:
+            # the spill segment is deleted when the session (and its universe) goes away
+            spill = spill_path()
+            st.session_state.universe = discard_with(Universe(ticker_spill=spill), spill)
+    u = st.session_state.universe
+    job = sim_job()
+    if job is not None and job.finished and not job.published:
+        # background run (fw.sim.background) ended: publish on this script thread
+        lg = st.session_state.get("league")
+        if lg is None: ok = job.publish()
+        else:
+            with lg.lock: ok = job.publish()
+        st.session_state.sim_result = (ok, job)
+    # the version this session's widgets were rendered from: what write() checks against
+    st.session_state.seen_version = st.session_state.get("render_version", u.version)
+    st.session_state.render_version = u.version
+    st.session_state.db = u.data
+    return use(u)
+
+def sim_job():
+    """The background run for this session's universe (shared by all of a league's sessions)."""
+    lg = st.session_state.get("league")
+    return lg.job if lg is not None else st.session_state.get("sim_job")
+
+def set_sim_job(job):
+    lg = st.session_state.get("league")
+    if lg is not None: lg.job = job
+    else: st.session_state.sim_job = job
+
+REFUSED = object()
+
+def write(fn, *args, **kw):
+    """Run a mutating action; in shared mode under the league lock with an
+    optimistic version check. Returns fn's result, or REFUSED."""
+    lg = st.session_state.get("league")
+    if lg is None: return fn(*args, **kw)
+    try:
+        with lg.write(st.session_state.get("seen_version")):
+            out = fn(*args, **kw)
+            st.session_state.render_version = lg.u.version   # own write: still up to date
+            return out
+    except StaleVersion:
+        st.warning("Someone else changed this league since your page loaded; nothing was changed. "
+                   "Check the latest state and try again.")
+        return REFUSED
+
+def locked():
+    """Hold the league lock (no version check) while reading shared state: pages
+    render inside it, since writers on other sessions' threads mutate the same
+    dicts and indexes. Re-entrant, so write() still works inside it."""
+    lg = st.session_state.get("league")
+    return lg.lock if lg is not None else nullcontext()
+
+@contextmanager
+def render_locked():
+    """Page wrapper: bind this session's universe (ss()) and render the whole
+    page under locked(). In a shared league no writer may change what a page
+    reads while it renders. Yields the universe."""
+    u = ss()
+    with locked(): yield u
+
+def paginate(pages, key):
+    """Page picker for a listing; returns the 0-based page index."""
+    if pages <= 1: return 0
+    # keyed on the page count: a search that shrinks the listing starts over at page 1
+    return st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{key}_{pages}") - 1
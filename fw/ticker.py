@@ -0,0 +1,131 @@
+"""Ticker (news feed) storage.
+
+Events are appended in O(1) to a bounded in-memory window. When the window
+overflows, the oldest events either spill to an append-only JSONL segment
+(if a spill path is set) or are dropped. Spilled events are indexed by week
+as byte ranges, so paged queries only read the weeks they need. A segment
+belongs to one Ticker: it is truncated when the Ticker is created.
+Events are fw.models.Event records; loaded JSON dicts are converted on entry.
+
+Long-running hosts (the Streamlit app) take segment paths from spill_path():
+one temp directory per process, removed at exit, and each segment deleted
+as soon as the universe that owns it is garbage-collected.
+"""
+import atexit, json, os, shutil, tempfile, weakref
+from collections import deque
+from itertools import islice
+from fw.models import Event
+
+DEFAULT_WINDOW = 5000
+_spill_dir = None
+
+def spill_path(prefix="ticker"):
+    """A fresh segment path in this process's spill directory."""
+    global _spill_dir
+    if _spill_dir is None:
+        _spill_dir = tempfile.mkdtemp(prefix="fw-spill-")
+        atexit.register(shutil.rmtree, _spill_dir, True)
+    fd, path = tempfile.mkstemp(prefix=f"{prefix}-", suffix=".jsonl", dir=_spill_dir)
+    os.close(fd)
+    return path
+
+def discard_with(owner, path):
+    """Delete the segment at `path` once `owner` is garbage-collected; returns owner."""
+    weakref.finalize(owner, _unlink, path)
+    return owner
+
+def _unlink(path):
+    try: os.remove(path)
+    except FileNotFoundError: pass
+
+class Ticker:
+    def __init__(self, events=(), window=DEFAULT_WINDOW, spill_path=None):
+        self.window = window
+        self.events = deque()            # oldest -> newest
+        self.spill_path = spill_path
+        self.spilled = 0
+        self.appended = 0                # events ever appended (journal bookmark)
+        self.week_ranges = {}            # week -> [[start, end], ...] byte ranges in the segment
+        self._types = {}                 # type -> count (window + spill)
+        if spill_path: open(spill_path, "wb").close()
+        for e in events: self.append(e)
+
+    # ---------- writes ----------
+    def append(self, e):
+        e = Event.of(e)
+        self.events.append(e)
+        self.appended += 1
+        t = e.type; self._types[t] = self._types.get(t, 0) + 1
+        if len(self.events) > self.window: self._evict()
+
+    def _evict(self):
+        # spill a chunk at a time so the file is touched once per window/4 events
+        n = max(1, len(self.events) - self.window + self.window//4)
+        old = [self.events.popleft() for _ in range(min(n, len(self.events)))]
+        if not self.spill_path:
+            for e in old: self._types[e.type] -= 1
+            return
+        with open(self.spill_path, "ab") as fh:
+            pos = fh.tell()
+            for e in old:
+                line = (json.dumps(e.to_dict()) + "\n").encode("utf-8")
+                fh.write(line)
+                self._add_range(e.week, pos, pos + len(line))
+                pos += len(line)
+        self.spilled += len(old)
+
+    def _add_range(self, week, start, end):
+        ranges = self.week_ranges.setdefault(week, [])
+        if ranges and ranges[-1][1] == start: ranges[-1][1] = end
+        else: ranges.append([start, end])
+
+    # ---------- reads ----------
+    def __len__(self): return len(self.events) + self.spilled
+
+    def recent(self, n):
+        """Newest n in-memory events, newest first."""
+        return list(islice(reversed(self.events), n))
+
+    def types(self):
+        return sorted(t for t, c in self._types.items() if c > 0)
+
+    def _spilled_newest_first(self, week_from, week_to):
+        if not self.week_ranges: return
+        weeks = sorted((w for w in self.week_ranges
+                        if (week_from is None or w >= week_from) and (week_to is None or w <= week_to)),
+                       reverse=True)
+        with open(self.spill_path, "rb") as fh:
+            for w in weeks:
+                for start, end in reversed(self.week_ranges[w]):
+                    fh.seek(start)
+                    for line in reversed(fh.read(end - start).splitlines()):
+                        yield Event.of(json.loads(line))
+
+    def query(self, week_from=None, week_to=None, types=None, min_severity=None, page=0, page_size=50):
+        """One page of matching events, newest first. Returns (events, has_more)."""
+        types = set(types) if types else None
+        def ok(e):
+            return ((week_from is None or e["week"] >= week_from) and (week_to is None or e["week"] <= week_to)
+                    and (types is None or e["type"] in types)
+                    and (min_severity is None or e["severity"] >= min_severity))
+        skip, out = page*page_size, []
+        def scan(it):
+            nonlocal skip
+            for e in it:
+                if not ok(e): continue
+                if skip: skip -= 1; continue
+                out.append(e)
+                if len(out) > page_size: return True
+            return False
+        if not scan(reversed(self.events)):
+            scan(self._spilled_newest_first(week_from, week_to))
+        return out[:page_size], len(out) > page_size
+
+    def since(self, mark):
+        """Events appended after bookmark `mark` that are still in memory, oldest first."""
+        n = min(self.appended - mark, len(self.events))
+        return list(islice(self.events, len(self.events) - n, None)) if n > 0 else []
+
+    def to_list(self):
+        """In-memory window, newest first (the save-file layout)."""
+        return list(reversed(self.events))
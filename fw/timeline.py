@@ -0,0 +1,114 @@
+"""Copy-on-write week snapshots: time travel and what-if branches.
+
+At every skip_time rollover the Timeline records the start-of-week state of
+the new week: the entities changed since the previous rollover, as
+references - not copies (the first snapshot is a shallow copy of each
+collection).
+Entities are never mutated in place (fw.db.update swaps in a new dict), so a
+reference taken at week N stays the week-N value. Per entity we keep a week-sorted
+version list; reading "entity X as of week N" is a bisect, and unchanged
+entities cost nothing per snapshot.
+
+    tl = universe().timeline
+    tl.get("federations", fid, 40)         # O(log weeks)
+    tl.as_of(40)                           # db dict of shared references
+    branch = fork(40)                      # Universe storing only what diverges
+
+The ticker is not versioned; views carry the events of weeks <= N that are
+still in the in-memory window. Employment records are append-only, so a
+view keeps the prefix that existed at week N.
+"""
+from bisect import bisect_right
+from collections import ChainMap
+
+VERSIONED = ("federations", "workers", "shows", "matches")
+
+class Timeline:
+    def __init__(self):
+        self.weeks = []          # captured weeks, ascending
+        self.base = {}           # coll -> shallow copy taken at the first capture
+        self.versions = {c: {} for c in VERSIONED}   # coll -> key -> ([weeks], [objs])
+        self.headers = {}        # week -> universe header copy
+        self.emp_len = {}        # week -> len(employment)
+        self.pending = {c: {} for c in VERSIONED}   # coll -> keys touched since the last capture, in touch order
+
+    def copy(self):
+        """Independent history sharing the recorded entities (they are immutable)."""
+        t = Timeline()
+        t.weeks = list(self.weeks); t.base = self.base
+        t.versions = {c: {k: (list(ws), list(objs)) for k, (ws, objs) in vs.items()} for c, vs in self.versions.items()}
+        t.headers = dict(self.headers); t.emp_len = dict(self.emp_len)
+        t.pending = {c: dict(ks) for c, ks in self.pending.items()}
+        return t
+
+    def note(self, coll, key):
+        keys = self.pending.get(coll)
+        if keys is not None: keys[key] = None
+
+    def capture(self, data, week):
+        """Record the start-of-`week` state (called by skip_time after advancing)."""
+        if not self.weeks:   # first capture: one C-speed copy, no per-entity history
+            self.base = {c: dict(data[c]) for c in VERSIONED}
+            self.pending = {c: {} for c in VERSIONED}
+        for coll, keys in self.pending.items():
+            if not keys: continue
+            cur, vs = data[coll], self.versions[coll]
+            for key in keys:
+                obj = cur.get(key); hist = vs.get(key)
+                if hist is None: vs[key] = ([week], [obj])
+                elif hist[0][-1] == week: hist[1][-1] = obj
+                else: hist[0].append(week); hist[1].append(obj)
+            keys.clear()
+        if not self.weeks or self.weeks[-1] != week: self.weeks.append(week)
+        self.headers[week] = dict(data["universe"])
+        self.emp_len[week] = len(data["employment"])
+
+    def _week(self, week):
+        i = bisect_right(self.weeks, week)
+        if not i: raise KeyError(f"no snapshot at or before week {week}")
+        return self.weeks[i-1]
+
+    def get(self, coll, key, week):
+        """Entity as it was at the start of `week` (None if it did not exist yet)."""
+        if not self.weeks or week < self.weeks[0]: return None
+        hist = self.versions[coll].get(key)
+        i = bisect_right(hist[0], week) if hist else 0
+        return hist[1][i-1] if i else self.base[coll].get(key)
+
+    def collection(self, coll, week):
+        out = dict(self.base[coll])
+        for key, (ws, objs) in self.versions[coll].items():
+            i = bisect_right(ws, week)
+            if not i: continue
+            if objs[i-1] is None: out.pop(key, None)
+            else: out[key] = objs[i-1]
+        return out
+
+    def as_of(self, week, employment=(), ticker=None):
+        """Read-only db dict for the start of `week`; entities are shared, not copied."""
+        wk = self._week(week)
+        d = {c: self.collection(c, wk) for c in VERSIONED}
+        d["universe"] = dict(self.headers[wk])
+        d["employment"] = list(employment[:self.emp_len[wk]])
+        d["ticker"] = [e for e in (ticker.to_list() if ticker is not None else []) if e["week"] <= wk]
+        return d
+
+def as_of(week):
+    from fw.db import universe
+    u = universe()
+    return u.timeline.as_of(week, u.data["employment"], u.data["ticker"])
+
+def fork(week, seed=None):
+    """Branch universe starting from the start of `week`.
+
+    Its collections are ChainMaps over the snapshot: writes land in the
+    branch's own layer, everything unchanged stays shared with the source.
+    """
+    from fw.db import Universe
+    base = as_of(week)
+    for c in VERSIONED: base[c] = ChainMap({}, base[c])
+    return Universe(base, seed=seed)
+
+def divergence(branch):
+    """Entities the branch stores itself, per collection."""
+    return {c: len(branch.data[c].maps[0]) for c in VERSIONED if isinstance(branch.data[c], ChainMap)}
@@ -1,7 +1,34 @@
-import time, random, re
+import re
 
-def new_id(prefix: str) -> str:
-    return f"{prefix}_{int(time.time()*1000)}_{random.randint(100,999)}"
+_B36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+def to_base36(n: int) -> str:
+    out = ""
+    while True:
+        n, r = divmod(n, 36); out = _B36[r] + out
+        if not n: return out
+
+class IdAllocator:
+    """Monotonic, collision-free compact ids: `<prefix>_<base36 counter>`.
+
+    One counter per prefix. After loading a universe, `observe()` every
+    existing key so new ids continue past them; keys in another format
+    (e.g. legacy `w_<ms>_<n>`) can never equal a compact id and are skipped.
+    """
+    def __init__(self):
+        self.counters = {}
+
+    def new(self, prefix: str) -> str:
+        n = self.counters.get(prefix, 0) + 1
+        self.counters[prefix] = n
+        return f"{prefix}_{to_base36(n)}"
+
+    def observe(self, key: str):
+        prefix, sep, tail = key.rpartition("_")
+        if not sep or ("_" in prefix and prefix.rsplit("_", 1)[1].isdigit()): return   # legacy <prefix>_<ms>_<n>
+        try: n = int(tail, 36)
+        except ValueError: return
+        if n > self.counters.get(prefix, 0): self.counters[prefix] = n
 
 def slugify(text: str) -> str:
     text = text.lower()
@@ -0,0 +1,61 @@
+"""Precomputed view models for the listing pages.
+
+Each builder runs once per universe version (Universe.version bumps on every
+mutation) and is cached on the Universe, so reruns that change nothing -
+widget drags, page flips, searches - reuse it. Searches are cached per
+(version, query) as well. A universe shared between sessions (fw.shared) is
+built once for all of them, under its lock.
+"""
+from fw.db import universe, employment_active
+
+def cached(key, build):
+    u = universe()
+    if u.lock is None: return _cached(u, key, build)
+    with u.lock: return _cached(u, key, build)   # shared universe (fw.shared): no writer mid-build
+
+def _cached(u, key, build):
+    c = u.view_cache
+    if c.get("version") != u.version:   # any mutation drops every view
+        c.clear(); c["version"] = u.version
+    if key not in c: c[key] = build()
+    return c[key]
+
+def _mask(e): return "Masked" if e.get("masked") else "Unmasked"
+
+def worker_rows():
+    """One row per worker, sorted by ring name, with the employment caption pre-rendered."""
+    def build():
+        d = universe().data; feds = d["federations"]; jobs = {}
+        for e in d["employment"]:
+            jobs.setdefault(e["worker_id"], []).append(
+                f"{feds[e['fed_id']]['name']} ({_mask(e)}) (wk {e['start_week']}→{e['end_week'] or '…'})")
+        rows = [{**w, "employment": "; ".join(jobs.get(wid, [])), "_q": w["ring_name"].lower()}
+                for wid, w in d["workers"].items()]
+        rows.sort(key=lambda r: r["_q"])
+        return rows
+    return cached("worker_rows", build)
+
+def federation_rows():
+    """One row per federation with its current roster (names sorted)."""
+    def build():
+        d = universe().data; wk = d["universe"]["current_week"]; rosters = {}
+        for e in d["employment"]:
+            if employment_active(e, wk): rosters.setdefault(e["fed_id"], {})[e["worker_id"]] = None
+        rows = []
+        for fid, f in d["federations"].items():
+            names = sorted(d["workers"][wid]["ring_name"] for wid in rosters.get(fid, {}))
+            rows.append({**f, "roster": names, "_q": f["name"].lower()})
+        return rows
+    return cached("federation_rows", build)
+
+def search(rows_key, rows, query):
+    """Rows whose name contains `query` (case-insensitive); cached per query."""
+    q = (query or "").strip().lower()
+    if not q: return rows
+    return cached((rows_key, q), lambda: [r for r in rows if q in r["_q"]])
+
+def page(rows, page_no, page_size):
+    """(rows on page `page_no`, page count)."""
+    pages = max(1, -(-len(rows) // page_size))
+    page_no = min(max(0, page_no), pages - 1)
+    return rows[page_no*page_size:(page_no+1)*page_size], pages
@@ -1,32 +1,67 @@
 import streamlit as st
-from fw.db import ss, current_week
-ss()
+from fw.st_state import render_locked
+from fw.db import current_week, shows_for_week
+from fw import perf
+from fw.timeline import as_of
+with render_locked() as u:
+    db = st.session_state.db
+    st.header("Dashboard")
+    c1,c2,c3 = st.columns(3)
 
-db = st.session_state.db
-st.header("Dashboard")
-c1,c2,c3 = st.columns(3)
+    with c1:
+        st.subheader("Federations")
+        for f in db["federations"].values():
+            st.write(f"**{f['name']}** — style: `{f['style']}`, pop: {f['popularity']}, safety: {f['safety']}")
+            st.caption(f"Rules: intergender={'✅' if f.get('allow_intergender') else '⛔'} • "
+                       f"tag={'✅' if f.get('allow_tag') else '⛔'} • "
+                       f"trios={'✅' if f.get('allow_trios') else '⛔'}")
 
-with c1:
-    st.subheader("Federations")
-    for f in db["federations"].values():
-        st.write(f"**{f['name']}** — style: `{f['style']}`, pop: {f['popularity']}, safety: {f['safety']}")
-        st.caption(f"Rules: intergender={'✅' if f.get('allow_intergender') else '⛔'} • "
-                   f"tag={'✅' if f.get('allow_tag') else '⛔'} • "
-                   f"trios={'✅' if f.get('allow_trios') else '⛔'}")
+    with c2:
+        st.subheader("Upcoming (this week)")
+        wk = current_week()
+        ups = shows_for_week(wk, "upcoming")
+        if ups:
+            for s in sorted(ups, key=lambda x: x["name"]):
+                fed = db["federations"][s["federation_id"]]["name"]
+                st.write(f"• **{s['name']}** ({fed}) — Week {s['scheduled_week']}")
+        else:
+            st.write("_None scheduled this week._")
 
-with c2:
-    st.subheader("Upcoming (this week)")
-    wk = current_week()
-    ups = [s for s in db["shows"].values() if s["scheduled_week"]==wk and s["status"]=="upcoming"]
-    if ups:
-        for s in sorted(ups, key=lambda x: x["name"]):
-            fed = db["federations"][s["federation_id"]]["name"]
-            st.write(f"• **{s['name']}** ({fed}) — Week {s['scheduled_week']}")
+    with c3:
+        st.subheader("Stats")
+        st.write(f"Workers: {len(db['workers'])}")
+        st.write(f"Feds: {len(db['federations'])}")
+        st.write(f"Shows: {len(db['shows'])}")
+
+    st.divider()
+    st.subheader("Time travel")
+    if u.timeline.weeks:
+        tw = st.select_slider("As of week", options=u.timeline.weeks, value=u.timeline.weeks[-1])
+        past = as_of(tw)
+        st.dataframe([{"federation": f["name"], "popularity then": f["popularity"],
+                       "popularity now": db["federations"][fid]["popularity"] if fid in db["federations"] else None}
+                      for fid, f in past["federations"].items()], use_container_width=True)
+        st.caption(f"Week {tw}: {len(past['shows'])} shows, {len(past['matches'])} matches.")
     else:
-        st.write("_None scheduled this week._")
+        st.caption("_Snapshots start at the first Skip Time._")
 
-with c3:
-    st.subheader("Stats")
-    st.write(f"Workers: {len(db['workers'])}")
-    st.write(f"Feds: {len(db['federations'])}")
-    st.write(f"Shows: {len(db['shows'])}")
+    st.divider()
+    st.subheader("Performance")
+    on = st.checkbox("Instrument hot paths (all sessions)", value=perf.enabled)
+    if on != perf.enabled: perf.enable(on)
+    rep = perf.report(u)
+    if rep:
+        wk_sel = st.selectbox("Week", list(rep.keys())[::-1])
+        b = rep[wk_sel]
+        p1, p2 = st.columns([3, 1])
+        with p1:
+            st.dataframe([{"entry point": n, "calls": t["calls"], "total ms": round(t["total_ms"], 2),
+                           "avg ms": round(t["avg_ms"], 3)} for n, t in b["timers"].items()], use_container_width=True)
+        with p2:
+            for name, n in sorted(b["counters"].items()): st.metric(name.replace("_", " "), n)
+        d1, d2 = st.columns(2)
+        with d1: st.download_button("Download perf.json", data=perf.to_json(u), file_name="perf.json", mime="application/json")
+        with d2:
+            if st.button("Reset stats"): perf.reset(u); st.rerun()
+    else:
+        st.caption("_No data yet — enable instrumentation and run a week._")
@@ -1,36 +1,65 @@
 import streamlit as st
-from fw.db import ss, create_fed, fed_employed_workers
+from fw.st_state import render_locked, paginate, write, REFUSED
+from fw.db import create_fed
 from fw.models import FED_STYLES
+from fw.sim.matchmaking import DEFAULT_CARD_LENGTH
+from fw.logic.standings import standings, title_name
+from fw import views
 
-ss(); db = st.session_state.db
-st.header("Federations")
+with render_locked():
+    db = st.session_state.db
+    st.header("Federations")
+    PAGE_SIZE = 25
 
-with st.expander("➕ Create Federation"):
-    name = st.text_input("Name")
-    style = st.selectbox("Style", FED_STYLES)
-    c1,c2,c3 = st.columns(3)
-    with c1: pop = st.slider("Popularity", 0, 100, 50)
-    with c2: saf = st.slider("Safety", 0, 100, 50)
-    with c3: liq = st.number_input("Liquidity", min_value=0, value=100000, step=10000)
-    about = st.text_area("About", "")
-    r1,r2,r3 = st.columns(3)
-    with r1: allow_inter = st.checkbox("Allow intergender", value=(style in ("hardcore","lucha","sports_ent")))
-    with r2: allow_tag = st.checkbox("Allow tag (2v2)", value=(style in ("sports_ent","hardcore","lucha")))
-    with r3: allow_trios = st.checkbox("Allow trios (3v3)", value=(style in ("lucha",)))
-    if st.button("Create Fed"):
-        fid = create_fed(name, style, pop, saf, liq, about, allow_inter, allow_tag, allow_trios)
-        st.success(f"Created {name} ({fid})")
+    with st.expander("➕ Create Federation"):
+        name = st.text_input("Name")
+        style = st.selectbox("Style", FED_STYLES)
+        c1,c2,c3 = st.columns(3)
+        with c1: pop = st.slider("Popularity", 0, 100, 50)
+        with c2: saf = st.slider("Safety", 0, 100, 50)
+        with c3: liq = st.number_input("Liquidity", min_value=0, value=100000, step=10000)
+        about = st.text_area("About", "")
+        r1,r2,r3 = st.columns(3)
+        with r1: allow_inter = st.checkbox("Allow intergender", value=(style in ("hardcore","lucha","sports_ent")))
+        with r2: allow_tag = st.checkbox("Allow tag (2v2)", value=(style in ("sports_ent","hardcore","lucha")))
+        with r3: allow_trios = st.checkbox("Allow trios (3v3)", value=(style in ("lucha",)))
+        k1,k2 = st.columns(2)
+        with k1: card_len = st.number_input("Matches per card", min_value=1, max_value=20, value=DEFAULT_CARD_LENGTH)
+        with k2: ppv_every = st.number_input("PPV every N weeks (0 = none)", min_value=0, max_value=52, value=0)
+        if st.button("Create Fed"):
+            fid = write(create_fed, name, style, pop, saf, liq, about, allow_inter, allow_tag, allow_trios, card_len, ppv_every)
+            if fid is not REFUSED: st.success(f"Created {name} ({fid})")
 
-for fid, fed in db["federations"].items():
-    st.subheader(fed["name"])
-    c1,c2,c3,c4 = st.columns(4)
-    with c1: st.write(f"Style: `{fed['style']}`")
-    with c2: st.write(f"Popularity: {fed['popularity']}")
-    with c3: st.write(f"Safety: {fed['safety']}")
-    with c4: st.write(f"Liquidity: ${fed['liquidity']:,}")
-    st.write(f"_About:_ {fed.get('about','')}")
-    st.caption(f"Rules: intergender={'✅' if fed.get('allow_intergender') else '⛔'} • "
-               f"tag={'✅' if fed.get('allow_tag') else '⛔'} • "
-               f"trios={'✅' if fed.get('allow_trios') else '⛔'}")
-    roster = fed_employed_workers(fid)
-    st.write(f"**Roster** ({len(roster)}): " + ", ".join([w["ring_name"] for w in roster]) if roster else "_Empty_")
+    q = st.text_input("Search federations", key="fed_q")
+    rows = views.search("federation_rows", views.federation_rows(), q)
+    st.caption(f"{len(rows)} federation(s)")
+    shown, pages = views.page(rows, paginate(-(-len(rows) // PAGE_SIZE), "fed_page"), PAGE_SIZE)
+    table = standings(); workers = db["workers"]
+
+    def names(ids): return " & ".join(workers[i]["ring_name"] if i in workers else i for i in ids)
+
+    for fed in shown:
+        st.subheader(fed["name"])
+        c1,c2,c3,c4 = st.columns(4)
+        with c1: st.write(f"Style: `{fed['style']}`")
+        with c2: st.write(f"Popularity: {fed['popularity']}")
+        with c3: st.write(f"Safety: {fed['safety']}")
+        with c4: st.write(f"Liquidity: ${fed['liquidity']:,}")
+        st.write(f"_About:_ {fed.get('about','')}")
+        st.caption(f"Rules: intergender={'✅' if fed.get('allow_intergender') else '⛔'} • "
+                   f"tag={'✅' if fed.get('allow_tag') else '⛔'} • "
+                   f"trios={'✅' if fed.get('allow_trios') else '⛔'} • "
+                   f"card: {fed.get('card_length', DEFAULT_CARD_LENGTH)} matches" +
+                   (f" • PPV every {fed['ppv_every']} weeks" if fed.get("ppv_every") else ""))
+        roster = fed["roster"]
+        st.write(f"**Roster** ({len(roster)}): " + ", ".join(roster) if roster else "_Empty_")
+        with st.expander("🏆 Standings & titles"):
+            top = table.top(fed["id"], 10)
+            if top:
+                st.table([{"#": i, "Worker": names([wid]), "W": w, "L": l} for i, (wid, w, l) in enumerate(top, start=1)])
+            else:
+                st.caption("_No bouts fought here yet_")
+            for title in table.titles(fed["id"]):
+                lineage = table.lineage(title); reign = lineage[-1]
+                st.write(f"**{title_name(fed, title[1])}:** {names(reign['holders'])} (since wk {reign['won_week']}, "
+                         f"{reign['defenses']} defense(s), {len(lineage)} reign(s) total)")
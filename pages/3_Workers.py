@@ -1,45 +1,55 @@
 import streamlit as st
-from fw.db import ss, create_worker, employ_worker, current_week
+from fw.st_state import render_locked, paginate, write, REFUSED
+from fw.db import create_worker, employ_worker, current_week
 from fw.models import FED_STYLES, GENDERS
-ss(); db = st.session_state.db
+from fw.logic.standings import standings
+from fw import views
+with render_locked():
+    db = st.session_state.db
+    st.header("Workers")
+    PAGE_SIZE = 50
 
-st.header("Workers")
+    with st.expander("➕ Create Worker"):
+        # a form: widget changes don't rerun the page until submit
+        with st.form("create_worker"):
+            ring = st.text_input("Ring name")
+            style = st.selectbox("Style", FED_STYLES, key="w_style")
+            align = st.selectbox("Alignment", ["face","heel","neutral"])
+            gender = st.selectbox("Gender", GENDERS, index=0)
+            c1,c2,c3,c4 = st.columns(4)
+            with c1: skill = st.slider("Skill", 0, 100, 60)
+            with c2: ch = st.slider("Charisma", 0, 100, 60)
+            with c3: pr = st.slider("Prestige", 0, 100, 40)
+            with c4: rk = st.slider("Risk", 0, 100, 30)
+            bio = st.text_area("Short bio", "")
+            if st.form_submit_button("Create Worker"):
+                wid = write(create_worker, ring, style, align, skill, ch, pr, rk, bio, gender)
+                if wid is not REFUSED: st.success(f"Created {ring} ({wid})")
 
-with st.expander("➕ Create Worker"):
-    ring = st.text_input("Ring name")
-    style = st.selectbox("Style", FED_STYLES, key="w_style")
-    align = st.selectbox("Alignment", ["face","heel","neutral"])
-    gender = st.selectbox("Gender", GENDERS, index=0)
-    c1,c2,c3,c4 = st.columns(4)
-    with c1: skill = st.slider("Skill", 0, 100, 60)
-    with c2: ch = st.slider("Charisma", 0, 100, 60)
-    with c3: pr = st.slider("Prestige", 0, 100, 40)
-    with c4: rk = st.slider("Risk", 0, 100, 30)
-    bio = st.text_area("Short bio", "")
-    if st.button("Create Worker"):
-        wid = create_worker(ring, style, align, skill, ch, pr, rk, bio, gender)
-        st.success(f"Created {ring} ({wid})")
+    st.subheader("Hire / Transfer")
+    if db["workers"] and db["federations"]:
+        hq = st.text_input("Find worker", key="hire_q")
+        cands = views.search("worker_rows", views.worker_rows(), hq)[:200]
+        if cands:
+            wid = st.selectbox("Worker", [r["id"] for r in cands], format_func=lambda i: db["workers"][i]["ring_name"], key="hire_w")
+            fid = st.selectbox("Federation", list(db["federations"].keys()), format_func=lambda i: db["federations"][i]["name"], key="hire_f")
+            masked = st.checkbox("Perform masked in this federation?", value=False)
+            if st.button("Employ (start this week)"):
+                if write(employ_worker, wid, fid, start_week=current_week(), masked=masked) is not REFUSED:
+                    st.success("Employment added.")
+        else:
+            st.caption("_No worker matches that name_")
 
-st.subheader("Hire / Transfer")
-if db["workers"] and db["federations"]:
-    wid = st.selectbox("Worker", list(db["workers"].keys()), format_func=lambda i: db["workers"][i]["ring_name"], key="hire_w")
-    fid = st.selectbox("Federation", list(db["federations"].keys()), format_func=lambda i: db["federations"][i]["name"], key="hire_f")
-    masked = st.checkbox("Perform masked in this federation?", value=False)
-    if st.button("Employ (start this week)"):
-        employ_worker(wid, fid, start_week=current_week(), masked=masked)
-        st.success("Employment added.")
-
-st.divider()
-for wid, w in db["workers"].items():
-    st.write(f"**{w['ring_name']}** — `{w['style']}` ({w['alignment']}, {w.get('gender','?')}) | "
-             f"Skill {w['skill']} • Cha {w['charisma']} • Pres {w['prestige']} • Risk {w['risk']}")
-    jobs = [e for e in db["employment"] if e["worker_id"]==wid]
-    if jobs:
-        st.caption("Employment: " + "; ".join([
-            f"{db['federations'][e['fed_id']]['name']} "
-            f"({'Masked' if e.get('masked') else 'Unmasked'}) "
-            f"(wk {e['start_week']}→{e['end_week'] or '…'})"
-            for e in jobs
-        ]))
-    else:
-        st.caption("_No employment records_")
+    st.divider()
+    q = st.text_input("Search workers", key="worker_q")
+    rows = views.search("worker_rows", views.worker_rows(), q)
+    st.caption(f"{len(rows)} worker(s)")
+    shown, pages = views.page(rows, paginate(-(-len(rows) // PAGE_SIZE), "worker_page"), PAGE_SIZE)
+    table = standings()
+    for w in shown:
+        rec = table.record(w["id"])
+        streak = f" • streak {'W' if rec['streak'] > 0 else 'L'}{abs(rec['streak'])}" if rec["streak"] else ""
+        st.write(f"**{w['ring_name']}** — `{w['style']}` ({w['alignment']}, {w.get('gender','?')}) | "
+                 f"Skill {w['skill']} • Cha {w['charisma']} • Pres {w['prestige']} • Risk {w['risk']} | "
+                 f"Record {rec['wins']}-{rec['losses']}{streak}")
+        st.caption(("Employment: " + w["employment"]) if w["employment"] else "_No employment records_")
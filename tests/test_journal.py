@@ -0,0 +1,42 @@
+import json
+from fw.db import Universe, bound, _json_default
+from fw.journal import JournalStore
+from fw.seedgen import generate_universe
+from fw.sim.engine import simulate_weeks
+
+def _dump(u):
+    d = {c: u.data[c] for c in ("universe", "federations", "workers", "shows", "matches", "employment")}
+    return json.dumps(d, sort_keys=True, default=_json_default)
+
+def test_saves_after_torn_tail_survive_reload(tmp_path):
+    path = str(tmp_path / "league.json")
+    u = Universe(generate_universe(feds=4, workers=2000, seed=1), seed=1)
+    store = JournalStore(path)
+    store.save(u)
+    with bound(u): simulate_weeks(1)
+    store.save(u)
+    with open(store.journal_path, "a", encoding="utf-8") as fh: fh.write('[["put", "shows"')   # crash mid-write
+
+    store = JournalStore(path)
+    u = store.load(seed=1)
+    with bound(u):
+        for _ in range(3):
+            simulate_weeks(1)
+            store.save(u)
+
+    loaded = JournalStore(path).load()
+    assert loaded.data["universe"]["current_week"] == u.data["universe"]["current_week"]
+    assert _dump(loaded) == _dump(u)
+
+def test_journal_replay_keeps_insertion_order(tmp_path):
+    path = str(tmp_path / "league.json")
+    u = Universe(generate_universe(feds=4, workers=2000, seed=2), seed=2)
+    store = JournalStore(path)
+    store.save(u)
+    with bound(u):
+        for _ in range(3):
+            simulate_weeks(1)
+            store.save(u)
+    loaded = JournalStore(path).load()
+    for coll in ("shows", "matches"):
+        assert list(loaded.data[coll]) == list(u.data[coll])
@@ -0,0 +1,31 @@
+import json
+from fw.db import Universe, bound, update, add_ticker
+from fw.seedgen import generate_universe
+from fw.sim.engine import simulate_weeks
+from fw.sqlite_store import SqliteStore
+from fw.ticker import DEFAULT_WINDOW
+
+def test_incremental_saves_keep_insertion_order(tmp_path):
+    store = SqliteStore(str(tmp_path / "league.db"))
+    u = Universe(generate_universe(feds=4, workers=500, seed=3), seed=3)
+    store.save(u)
+    with bound(u):
+        for _ in range(3):
+            simulate_weeks(1)
+            store.save(u)
+        update("federations", next(iter(u.data["federations"])), popularity=50)
+        store.save(u)
+    loaded = SqliteStore(store.path).load()
+    for coll in ("federations", "workers", "shows", "matches"):
+        assert list(loaded.data[coll]) == list(u.data[coll])
+
+def test_export_keeps_every_ticker_row(tmp_path):
+    store = SqliteStore(str(tmp_path / "league.db"))
+    u = Universe(generate_universe(feds=4, workers=50, seed=4), seed=4)
+    with bound(u):
+        for _ in range(3):   # saved in steps: the live ticker itself keeps only its window
+            for i in range(DEFAULT_WINDOW // 2): add_ticker("NOTE", headline=f"n{i}")
+            store.save(u)
+    n = store.count("ticker")
+    assert n > DEFAULT_WINDOW
+    assert len(json.loads(store.export_json())["ticker"]) == n